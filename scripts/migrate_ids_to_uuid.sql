@@ -0,0 +1,72 @@
+-- scripts/migrate_ids_to_uuid.sql
+--
+-- Converts the id and id-reference columns of a database created before ids
+-- became native uuid columns (they used to be varchar(36)). create_all does
+-- not alter existing tables, and comparing uuid with varchar fails at runtime.
+--
+--   psql "$DATABASE_URL" -f scripts/migrate_ids_to_uuid.sql
+--
+-- Runs in one transaction: a value that is not a valid uuid aborts the whole
+-- migration and leaves the schema untouched. Stop the app while it runs; the
+-- ALTERs rewrite each table under an exclusive lock.
+
+BEGIN;
+
+-- Foreign keys first: a referencing and a referenced column cannot change
+-- type one at a time.
+ALTER TABLE event_seat_types DROP CONSTRAINT event_seat_types_event_id_fkey;
+ALTER TABLE event_bookings DROP CONSTRAINT event_bookings_event_id_fkey;
+ALTER TABLE event_waitlist DROP CONSTRAINT event_waitlist_event_id_fkey;
+ALTER TABLE dining_table_bookings DROP CONSTRAINT dining_table_bookings_slot_id_fkey;
+
+ALTER TABLE bookings
+    ALTER COLUMN id TYPE uuid USING id::uuid;
+
+ALTER TABLE seat_inventory
+    ALTER COLUMN id TYPE uuid USING id::uuid;
+
+ALTER TABLE events
+    ALTER COLUMN id TYPE uuid USING id::uuid;
+
+ALTER TABLE event_seat_types
+    ALTER COLUMN id TYPE uuid USING id::uuid,
+    ALTER COLUMN event_id TYPE uuid USING event_id::uuid;
+
+ALTER TABLE event_bookings
+    ALTER COLUMN id TYPE uuid USING id::uuid,
+    ALTER COLUMN event_id TYPE uuid USING event_id::uuid;
+
+ALTER TABLE event_waitlist
+    ALTER COLUMN id TYPE uuid USING id::uuid,
+    ALTER COLUMN event_id TYPE uuid USING event_id::uuid,
+    ALTER COLUMN booking_id TYPE uuid USING booking_id::uuid;
+
+ALTER TABLE dining_table_slots
+    ALTER COLUMN id TYPE uuid USING id::uuid;
+
+ALTER TABLE dining_table_bookings
+    ALTER COLUMN id TYPE uuid USING id::uuid,
+    ALTER COLUMN slot_id TYPE uuid USING slot_id::uuid;
+
+ALTER TABLE payment_webhook_events
+    ALTER COLUMN id TYPE uuid USING id::uuid,
+    ALTER COLUMN booking_id TYPE uuid USING booking_id::uuid;
+
+ALTER TABLE outbox_events
+    ALTER COLUMN id TYPE uuid USING id::uuid,
+    ALTER COLUMN aggregate_id TYPE uuid USING aggregate_id::uuid;
+
+ALTER TABLE event_seat_types
+    ADD CONSTRAINT event_seat_types_event_id_fkey
+    FOREIGN KEY (event_id) REFERENCES events (id);
+ALTER TABLE event_bookings
+    ADD CONSTRAINT event_bookings_event_id_fkey
+    FOREIGN KEY (event_id) REFERENCES events (id);
+ALTER TABLE event_waitlist
+    ADD CONSTRAINT event_waitlist_event_id_fkey
+    FOREIGN KEY (event_id) REFERENCES events (id);
+ALTER TABLE dining_table_bookings
+    ADD CONSTRAINT dining_table_bookings_slot_id_fkey
+    FOREIGN KEY (slot_id) REFERENCES dining_table_slots (id);
+
+COMMIT;
@@ -1,8 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
+import csv
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+import io
 from pathlib import Path
 import sys
+from uuid import uuid4
 
-from sqlalchemy import delete, select
+from sqlalchemy import case, func, insert, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 # Allow running as: python scripts/seed_demo_data.py
 ROOT_DIR = Path(__file__).resolve().parents[1]
@@ -10,229 +18,314 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from src.infrastructure.db.models import DiningTableSlot, Event, EventSeatType
-from src.infrastructure.db.session import SessionLocal
+from src.infrastructure.db.session import create_db_engine
 
 
-def _dt(days_from_now: int, hour: int, minute: int) -> datetime:
-    ist = timezone(timedelta(hours=5, minutes=30))
-    now_ist = datetime.now(ist)
-    target = now_ist + timedelta(days=days_from_now)
-    return target.replace(hour=hour, minute=minute, second=0, microsecond=0)
+IST = timezone(timedelta(hours=5, minutes=30))
 
+# The seed never reads rows back, so it writes through Core tables and skips
+# the ORM unit of work entirely.
+events_table = Event.__table__
+seat_types_table = EventSeatType.__table__
+dining_slots_table = DiningTableSlot.__table__
 
-def seed_events(db) -> None:
-    event_defs = [
-        {
-            "title": "Sunidhi Chauhan Live Concert",
-            "type": "CONCERT",
-            "date_time": _dt(days_from_now=10, hour=19, minute=30),
-            "location": "Indira Gandhi Arena, New Delhi",
-            "seat_types": [
-                {"seat_type": "Regular", "price": 1800, "total_seats": 400},
-                {"seat_type": "VIP", "price": 4500, "total_seats": 120},
-            ],
-        },
-        {
-            "title": "Holi Festival 2026",
-            "type": "FESTIVAL",
-            "date_time": _dt(days_from_now=15, hour=11, minute=0),
-            "location": "Jawaharlal Nehru Stadium Grounds, Delhi",
-            "seat_types": [
-                {"seat_type": "General", "price": 1200, "total_seats": 700},
-                {"seat_type": "Premium", "price": 2800, "total_seats": 180},
-            ],
-        },
-        {
-            "title": "Delhi Tech Conference 2026",
-            "type": "CONFERENCE",
-            "date_time": _dt(days_from_now=20, hour=10, minute=0),
-            "location": "Pragati Maidan, New Delhi",
-            "seat_types": [
-                {"seat_type": "Standard", "price": 2200, "total_seats": 450},
-                {"seat_type": "Executive", "price": 3800, "total_seats": 140},
-            ],
-        },
-        {
-            "title": "India vs Australia T20",
-            "type": "SPORTS",
-            "date_time": _dt(days_from_now=8, hour=19, minute=0),
-            "location": "Arun Jaitley Stadium, Delhi",
-            "seat_types": [
-                {"seat_type": "North Stand", "price": 1500, "total_seats": 600},
-                {"seat_type": "Pavilion", "price": 4200, "total_seats": 160},
-            ],
-        },
-        {
-            "title": "Stand-up Night: Zakir Special",
-            "type": "COMEDY",
-            "date_time": _dt(days_from_now=12, hour=20, minute=0),
-            "location": "Siri Fort Auditorium, Delhi",
-            "seat_types": [
-                {"seat_type": "Silver", "price": 999, "total_seats": 320},
-                {"seat_type": "Gold", "price": 1999, "total_seats": 90},
-            ],
-        },
-        {
-            "title": "Startup Pitch Expo",
-            "type": "EXPO",
-            "date_time": _dt(days_from_now=25, hour=11, minute=30),
-            "location": "Yashobhoomi, Dwarka",
-            "seat_types": [
-                {"seat_type": "Visitor", "price": 800, "total_seats": 700},
-                {"seat_type": "Investor Pass", "price": 5000, "total_seats": 80},
-            ],
-        },
-        {
-            "title": "Classical Evening with Symphony",
-            "type": "MUSIC",
-            "date_time": _dt(days_from_now=18, hour=18, minute=45),
-            "location": "Kamani Auditorium, Delhi",
-            "seat_types": [
-                {"seat_type": "Balcony", "price": 1600, "total_seats": 260},
-                {"seat_type": "Orchestra", "price": 3200, "total_seats": 110},
-            ],
-        },
+# Statements are built once at import; executions only bind parameters and
+# hit SQLAlchemy's compiled cache.
+EVENT_INSERT = insert(events_table)
+
+SEAT_TYPE_INSERT = insert(seat_types_table)
+
+# Above this many fresh seat-type rows, psycopg2 streams them with COPY instead
+# of INSERT; below it the extra buffer handling is not worth it.
+SEAT_TYPE_COPY_THRESHOLD = 100
+
+_seat_type_insert = pg_insert(seat_types_table)
+SEAT_TYPE_UPSERT = _seat_type_insert.on_conflict_do_update(
+    index_elements=[seat_types_table.c.event_id, seat_types_table.c.seat_type],
+    set_={
+        "price": _seat_type_insert.excluded.price,
+        "total_seats": _seat_type_insert.excluded.total_seats,
+        "available_seats": _seat_type_insert.excluded.available_seats,
+        "updated_at": func.now(),
+    },
+)
+
+_dining_slot_insert = pg_insert(dining_slots_table)
+DINING_SLOT_UPSERT = _dining_slot_insert.on_conflict_do_update(
+    index_elements=[
+        dining_slots_table.c.restaurant_name,
+        dining_slots_table.c.table_number,
+        dining_slots_table.c.date_time,
+    ],
+    set_={
+        "capacity": _dining_slot_insert.excluded.capacity,
+        "price_per_table": _dining_slot_insert.excluded.price_per_table,
+        # status is left to the column default ("AVAILABLE") on insert.
+        "status": _dining_slot_insert.excluded.status,
+        "updated_at": func.now(),
+    },
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SeatDef:
+    seat_type: str
+    price: int
+    total_seats: int
+
+
+@dataclass(frozen=True, slots=True)
+class EventDef:
+    title: str
+    type: str
+    days_from_now: int
+    hour: int
+    minute: int
+    location: str
+    seat_types: tuple[SeatDef, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class DiningSlotDef:
+    restaurant_name: str
+    table_number: str
+    capacity: int
+    price_per_table: int
+    days_from_now: int
+    hour: int
+    minute: int
+
+
+EVENT_DEFS: tuple[EventDef, ...] = (
+    EventDef(
+        title="Sunidhi Chauhan Live Concert",
+        type="CONCERT",
+        days_from_now=10, hour=19, minute=30,
+        location="Indira Gandhi Arena, New Delhi",
+        seat_types=(SeatDef("Regular", 1800, 400), SeatDef("VIP", 4500, 120)),
+    ),
+    EventDef(
+        title="Holi Festival 2026",
+        type="FESTIVAL",
+        days_from_now=15, hour=11, minute=0,
+        location="Jawaharlal Nehru Stadium Grounds, Delhi",
+        seat_types=(SeatDef("General", 1200, 700), SeatDef("Premium", 2800, 180)),
+    ),
+    EventDef(
+        title="Delhi Tech Conference 2026",
+        type="CONFERENCE",
+        days_from_now=20, hour=10, minute=0,
+        location="Pragati Maidan, New Delhi",
+        seat_types=(SeatDef("Standard", 2200, 450), SeatDef("Executive", 3800, 140)),
+    ),
+    EventDef(
+        title="India vs Australia T20",
+        type="SPORTS",
+        days_from_now=8, hour=19, minute=0,
+        location="Arun Jaitley Stadium, Delhi",
+        seat_types=(SeatDef("North Stand", 1500, 600), SeatDef("Pavilion", 4200, 160)),
+    ),
+    EventDef(
+        title="Stand-up Night: Zakir Special",
+        type="COMEDY",
+        days_from_now=12, hour=20, minute=0,
+        location="Siri Fort Auditorium, Delhi",
+        seat_types=(SeatDef("Silver", 999, 320), SeatDef("Gold", 1999, 90)),
+    ),
+    EventDef(
+        title="Startup Pitch Expo",
+        type="EXPO",
+        days_from_now=25, hour=11, minute=30,
+        location="Yashobhoomi, Dwarka",
+        seat_types=(SeatDef("Visitor", 800, 700), SeatDef("Investor Pass", 5000, 80)),
+    ),
+    EventDef(
+        title="Classical Evening with Symphony",
+        type="MUSIC",
+        days_from_now=18, hour=18, minute=45,
+        location="Kamani Auditorium, Delhi",
+        seat_types=(SeatDef("Balcony", 1600, 260), SeatDef("Orchestra", 3200, 110)),
+    ),
+    EventDef(
+        title="Food & Culture Carnival",
+        type="FESTIVAL",
+        days_from_now=30, hour=17, minute=0,
+        location="Major Dhyan Chand National Stadium",
+        seat_types=(SeatDef("General", 700, 900), SeatDef("Family Lounge", 2600, 130)),
+    ),
+)
+
+DINING_SLOT_DEFS: tuple[DiningSlotDef, ...] = (
+    DiningSlotDef("Hotel Star", "A1", 2, 1500, days_from_now=2, hour=20, minute=0),
+    DiningSlotDef("Hotel Star", "B4", 4, 2800, days_from_now=2, hour=21, minute=30),
+    DiningSlotDef("Hotel Star", "C2", 6, 4200, days_from_now=3, hour=20, minute=15),
+    DiningSlotDef("Skyline Rooftop", "R1", 2, 1800, days_from_now=2, hour=19, minute=30),
+    DiningSlotDef("Skyline Rooftop", "R4", 4, 3200, days_from_now=4, hour=21, minute=0),
+    DiningSlotDef("Spice Court", "S2", 2, 1400, days_from_now=1, hour=20, minute=15),
+    DiningSlotDef("Spice Court", "S7", 6, 3900, days_from_now=5, hour=20, minute=45),
+    DiningSlotDef("Ocean Pearl", "O3", 4, 2600, days_from_now=3, hour=19, minute=45),
+)
+
+
+def _day_bases(now: datetime) -> dict[int, datetime]:
+    # Several definitions share a day offset; shift `now` once per distinct day.
+    days = {item.days_from_now for item in (*EVENT_DEFS, *DINING_SLOT_DEFS)}
+    return {day: now + timedelta(days=day) for day in days}
+
+
+def _dt(bases: dict[int, datetime], days_from_now: int, hour: int, minute: int) -> datetime:
+    return bases[days_from_now].replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+
+def _event_update(rows: list[dict]):
+    # UPDATE ... SET col = CASE title WHEN ... END WHERE title IN (...) RETURNING
+    # refreshes every existing event and reports which titles already exist,
+    # so the lookup and the update share one round-trip.
+    def by_title(column: str):
+        return case({row["title"]: row[column] for row in rows}, value=events_table.c.title)
+
+    return (
+        update(events_table)
+        .where(events_table.c.title.in_([row["title"] for row in rows]))
+        .values(
+            type=by_title("type"),
+            date_time=by_title("date_time"),
+            location=by_title("location"),
+        )
+        .returning(events_table.c.id, events_table.c.title)
+    )
+
+
+def _copy_seat_types(conn: Connection, rows: list[dict]) -> None:
+    # COPY bypasses SQLAlchemy column defaults, so id and available_seats are
+    # filled in here.
+    columns = ("id", "event_id", "seat_type", "price", "total_seats", "available_seats")
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(
+        (
+            str(uuid4()),
+            row["event_id"],
+            row["seat_type"],
+            row["price"],
+            row["total_seats"],
+            row["total_seats"],
+        )
+        for row in rows
+    )
+    buffer.seek(0)
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {seat_types_table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _insert_seat_types(conn: Connection, rows: list[dict]) -> None:
+    if len(rows) > SEAT_TYPE_COPY_THRESHOLD and conn.dialect.driver == "psycopg2":
+        _copy_seat_types(conn, rows)
+    else:
+        conn.execute(SEAT_TYPE_INSERT, rows)
+
+
+def seed_events(conn: Connection, bases: dict[int, datetime]) -> None:
+    event_rows = [
         {
-            "title": "Food & Culture Carnival",
-            "type": "FESTIVAL",
-            "date_time": _dt(days_from_now=30, hour=17, minute=0),
-            "location": "Major Dhyan Chand National Stadium",
-            "seat_types": [
-                {"seat_type": "General", "price": 700, "total_seats": 900},
-                {"seat_type": "Family Lounge", "price": 2600, "total_seats": 130},
-            ],
-        },
+            "title": item.title,
+            "type": item.type,
+            "date_time": _dt(bases, item.days_from_now, item.hour, item.minute),
+            "location": item.location,
+        }
+        for item in EVENT_DEFS
     ]
-
-    for item in event_defs:
-        existing = db.execute(
-            select(Event).where(Event.title == item["title"])
-        ).scalar_one_or_none()
-        if existing:
-            db.execute(delete(EventSeatType).where(EventSeatType.event_id == existing.id))
-            event = existing
-            event.type = item["type"]
-            event.date_time = item["date_time"]
-            event.location = item["location"]
-        else:
-            event = Event(
-                title=item["title"],
-                type=item["type"],
-                date_time=item["date_time"],
-                location=item["location"],
-            )
-            db.add(event)
-            db.flush()
-
-        for seat in item["seat_types"]:
-            db.add(
-                EventSeatType(
-                    event_id=event.id,
-                    seat_type=seat["seat_type"],
-                    price=seat["price"],
-                    total_seats=seat["total_seats"],
-                    available_seats=seat["total_seats"],
-                )
+    # Titles are not unique in events (only the seed keys on them), so a title
+    # shared by several events would have all of them overwritten and seat
+    # types attached to just one. Fail instead; the transaction rolls back.
+    existing_ids: dict[str, str] = {}
+    for row in conn.execute(_event_update(event_rows)):
+        if row.title in existing_ids:
+            raise RuntimeError(
+                f"Several events are titled {row.title!r}; the seed matches demo "
+                "events by title. Rename or delete the extra events and rerun."
             )
+        existing_ids[row.title] = row.id
 
+    new_event_rows = []
+    new_seat_rows = []
+    existing_seat_rows = []
+    for item, row in zip(EVENT_DEFS, event_rows):
+        event_id = existing_ids.get(item.title)
+        seat_rows = existing_seat_rows
+        if not event_id:
+            # Ids are generated client-side, so seat types can reference new
+            # events without a flush round-trip per event.
+            event_id = str(uuid4())
+            new_event_rows.append({**row, "id": event_id})
+            seat_rows = new_seat_rows
 
-def seed_dining(db) -> None:
-    slots = [
-        {
-            "restaurant_name": "Hotel Star",
-            "table_number": "A1",
-            "capacity": 2,
-            "price_per_table": 1500,
-            "date_time": _dt(days_from_now=2, hour=20, minute=0),
-        },
-        {
-            "restaurant_name": "Hotel Star",
-            "table_number": "B4",
-            "capacity": 4,
-            "price_per_table": 2800,
-            "date_time": _dt(days_from_now=2, hour=21, minute=30),
-        },
-        {
-            "restaurant_name": "Hotel Star",
-            "table_number": "C2",
-            "capacity": 6,
-            "price_per_table": 4200,
-            "date_time": _dt(days_from_now=3, hour=20, minute=15),
-        },
-        {
-            "restaurant_name": "Skyline Rooftop",
-            "table_number": "R1",
-            "capacity": 2,
-            "price_per_table": 1800,
-            "date_time": _dt(days_from_now=2, hour=19, minute=30),
-        },
-        {
-            "restaurant_name": "Skyline Rooftop",
-            "table_number": "R4",
-            "capacity": 4,
-            "price_per_table": 3200,
-            "date_time": _dt(days_from_now=4, hour=21, minute=0),
-        },
-        {
-            "restaurant_name": "Spice Court",
-            "table_number": "S2",
-            "capacity": 2,
-            "price_per_table": 1400,
-            "date_time": _dt(days_from_now=1, hour=20, minute=15),
-        },
-        {
-            "restaurant_name": "Spice Court",
-            "table_number": "S7",
-            "capacity": 6,
-            "price_per_table": 3900,
-            "date_time": _dt(days_from_now=5, hour=20, minute=45),
-        },
+        seat_rows.extend(
+            {
+                "event_id": event_id,
+                "seat_type": seat.seat_type,
+                "price": seat.price,
+                "total_seats": seat.total_seats,
+            }
+            for seat in item.seat_types
+        )
+
+    if new_event_rows:
+        conn.execute(EVENT_INSERT, new_event_rows)
+        # Seat types of brand-new events cannot conflict, so they skip the upsert.
+        _insert_seat_types(conn, new_seat_rows)
+
+    if existing_seat_rows:
+        # One executemany upsert; the dialect folds it into multi-row INSERTs.
+        conn.execute(SEAT_TYPE_UPSERT, existing_seat_rows)
+
+
+def seed_dining(conn: Connection, bases: dict[int, datetime]) -> None:
+    rows = [
         {
-            "restaurant_name": "Ocean Pearl",
-            "table_number": "O3",
-            "capacity": 4,
-            "price_per_table": 2600,
-            "date_time": _dt(days_from_now=3, hour=19, minute=45),
-        },
+            "restaurant_name": slot.restaurant_name,
+            "table_number": slot.table_number,
+            "capacity": slot.capacity,
+            "price_per_table": slot.price_per_table,
+            "date_time": _dt(bases, slot.days_from_now, slot.hour, slot.minute),
+        }
+        for slot in DINING_SLOT_DEFS
     ]
+    conn.execute(DINING_SLOT_UPSERT, rows)
 
-    for slot in slots:
-        existing = db.execute(
-            select(DiningTableSlot)
-            .where(DiningTableSlot.restaurant_name == slot["restaurant_name"])
-            .where(DiningTableSlot.table_number == slot["table_number"])
-            .where(DiningTableSlot.date_time == slot["date_time"])
-        ).scalar_one_or_none()
-        if existing:
-            existing.capacity = slot["capacity"]
-            existing.price_per_table = slot["price_per_table"]
-            existing.status = "AVAILABLE"
-            continue
-
-        db.add(
-            DiningTableSlot(
-                restaurant_name=slot["restaurant_name"],
-                table_number=slot["table_number"],
-                capacity=slot["capacity"],
-                price_per_table=slot["price_per_table"],
-                date_time=slot["date_time"],
-                status="AVAILABLE",
-            )
-        )
+
+def _seed_in_transaction(engine: Engine, seed, bases: dict[int, datetime]) -> None:
+    with engine.begin() as conn:
+        seed(conn, bases)
 
 
 def main() -> None:
-    db = SessionLocal()
+    bases = _day_bases(datetime.now(IST))
+    # One-shot script: unpooled connections, no pre-ping SELECT 1.
+    engine = create_db_engine(
+        poolclass=NullPool,
+        connect_args={"application_name": "seed_demo_data"},
+    )
     try:
-        seed_events(db)
-        seed_dining(db)
-        db.commit()
-        print("Seed complete: demo events and dining slots upserted.")
-    except Exception:
-        db.rollback()
-        raise
+        # Events and dining slots touch disjoint tables, so each runs in its own
+        # transaction on its own connection and their round-trips overlap. Both
+        # are idempotent upserts: if one fails, rerunning the seed is safe.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(_seed_in_transaction, engine, seed, bases)
+                for seed in (seed_events, seed_dining)
+            ]
+            for future in futures:
+                future.result()
     finally:
-        db.close()
+        engine.dispose()
+    print("Seed complete: demo events and dining slots upserted.")
 
 
 if __name__ == "__main__":
@@ -1,27 +1,38 @@
-from collections import deque
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import hashlib
+import hmac
 import json
 import logging
 import os
+import tempfile
 import threading
+import time
 from uuid import uuid4
 # from uuid import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-from sqlalchemy import select, delete
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, bindparam, case, delete, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, OperationalError, TimeoutError as SQLAlchemyTimeoutError
 import razorpay
+from requests import Session as HTTPSession
+from requests.adapters import HTTPAdapter
 
-from src.infrastructure.db.session import SessionLocal
+from src.infrastructure.db.session import DATABASE_URL, ReadOnlySessionLocal, SessionLocal
 from src.application.booking_service import BookingService
 from src.api.schemas.schemas import (
     BookingRequest,
     BookingResponse,
     SeedInventoryRequest,
+    InventoryStatsResponse,
     PaymentRequest,
     EventCreate,
     EventResponse,
@@ -38,6 +49,8 @@ from src.api.schemas.schemas import (
     DeferredEventBookingResponse,
     DeferredEventBookingStatusResponse,
     OutboxEventResponse,
+    OutboxEventReleaseRequest,
+    construct_from_attributes,
 )
 from src.domain.exceptions import (
     InsufficientInventoryError,
@@ -55,23 +68,214 @@ from src.infrastructure.db.models import (
     OutboxEvent,
     PaymentWebhookEvent,
 )
+from src.infrastructure.repositories.outbox_repository import OutboxRepository
 from src.infrastructure.repositories.seat_repository import SeatRepository
+from src.infrastructure.queue.deferred_booking_queue import DeferredBookingQueue
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="src/templates")
+# Same environment Jinja2Templates(directory=...) builds, except that compiled
+# templates are not re-validated with a stat() of their file on every render.
+# Templates only change with a deploy, which restarts the process; set
+# TEMPLATE_AUTO_RELOAD=true when editing them locally.
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader("src/templates"),
+        autoescape=select_autoescape(),
+        auto_reload=os.getenv("TEMPLATE_AUTO_RELOAD", "false").lower() == "true",
+    )
+)
 logger = logging.getLogger(__name__)
 
 GRACEFUL_QUEUE_MAX_SIZE = int(os.getenv("GRACEFUL_QUEUE_MAX_SIZE", "500"))
-_deferred_event_booking_queue: deque[dict] = deque(maxlen=GRACEFUL_QUEUE_MAX_SIZE)
-_deferred_queue_lock = threading.Lock()
+
+
+# Opened on first use rather than at import, so importing the routes (tests,
+# scripts) never touches the queue file. Every worker process on the host that
+# serves the same database shares it, so a retry can land on any of them; the
+# default file name is keyed on DATABASE_URL so unrelated deployments and test
+# runs on the host do not pick up each other's bookings.
+@lru_cache(maxsize=1)
+def _deferred_event_booking_queue() -> DeferredBookingQueue:
+    path = os.getenv("DEFERRED_QUEUE_PATH")
+    if not path:
+        database_key = hashlib.sha256(DATABASE_URL.encode()).hexdigest()[:16]
+        path = os.path.join(
+            tempfile.gettempdir(), f"district_deferred_bookings-{database_key}.sqlite3"
+        )
+    return DeferredBookingQueue(path=path, max_size=GRACEFUL_QUEUE_MAX_SIZE)
+
+
+# Bookings are reserved (seats or table held) and committed before their
+# Razorpay order is created. A PENDING booking still without an order id after
+# this long is presumed abandoned, and expire_unordered_holds releases its hold.
+UNORDERED_HOLD_TIMEOUT_SECONDS = float(os.getenv("UNORDERED_HOLD_TIMEOUT_SECONDS", "600"))
+
+# A claimed outbox event not marked published or released within this long is
+# handed to the next claimer, so a publisher that dies mid-batch strands nothing.
+OUTBOX_CLAIM_LEASE_SECONDS = float(os.getenv("OUTBOX_CLAIM_LEASE_SECONDS", "300"))
+
+RAZORPAY_ORDER_WORKERS = 8
+# Keep-alive connections held to the Razorpay API per process. requests keeps
+# only 10 per host by default, fewer than concurrent order creation can use.
+RAZORPAY_HTTP_POOL_SIZE = int(os.getenv("RAZORPAY_HTTP_POOL_SIZE", "50"))
+
+# Ids of UUID-keyed rows. Postgres fails a query on a malformed uuid instead of
+# matching nothing, so those are rejected with a 422 before any query runs.
+_UUID_PATTERN = r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+UUIDPath = Annotated[str, Path(pattern=_UUID_PATTERN)]
+UUIDCursor = Annotated[str | None, Query(pattern=_UUID_PATTERN)]
+
+# Hot statements are built once at import; requests only bind parameters, so
+# SQLAlchemy skips rebuilding the expression tree and hits its compiled cache.
+_EVENTS_WITH_SEAT_TYPES = (
+    select(Event)
+    .options(selectinload(Event.seat_types))
+    .order_by(Event.date_time, Event.id)
+)
+_EVENT_WITH_SEAT_TYPES_BY_ID = (
+    select(Event)
+    .options(selectinload(Event.seat_types))
+    .where(Event.id == bindparam("event_id"))
+)
+_SEAT_TYPE_FOR_UPDATE = (
+    select(EventSeatType)
+    .where(EventSeatType.event_id == bindparam("event_id"))
+    .where(EventSeatType.seat_type == bindparam("seat_type"))
+    .with_for_update()
+    # Locked reads must see counts changed by atomic UPDATEs earlier in the
+    # transaction, even if the row is already in the identity map.
+    .execution_options(populate_existing=True)
+)
+# Reserves seats in one statement: the availability check and the decrement
+# happen under the UPDATE's own row lock, and no row comes back if the seat
+# type is missing or short of seats.
+_RESERVE_SEATS = (
+    update(EventSeatType)
+    .where(EventSeatType.event_id == bindparam("b_event_id"))
+    .where(EventSeatType.seat_type == bindparam("b_seat_type"))
+    .where(EventSeatType.available_seats >= bindparam("b_seat_count"))
+    .values(available_seats=EventSeatType.available_seats - bindparam("b_seat_count"))
+    .returning(EventSeatType.price)
+    .execution_options(synchronize_session=False)
+)
+# Head of the WAITING queue (same order as _waitlist_position). The seat-type
+# row lock is what serializes promotion; SKIP LOCKED keeps one entry busy
+# elsewhere from stalling the queue, and LIMIT bounds how many rows are locked.
+_WAITING_ENTRIES_FOR_UPDATE = (
+    select(EventWaitlistEntry)
+    .where(EventWaitlistEntry.event_id == bindparam("event_id"))
+    .where(EventWaitlistEntry.seat_type == bindparam("seat_type"))
+    .where(EventWaitlistEntry.status == "WAITING")
+    .order_by(EventWaitlistEntry.created_at, EventWaitlistEntry.id)
+    .limit(bindparam("limit"))
+    .with_for_update(skip_locked=True)
+)
+# Holds an AVAILABLE slot in one round-trip; returns no row when the slot is
+# missing or already held/booked.
+_HOLD_TABLE_SLOT = (
+    update(DiningTableSlot)
+    .where(DiningTableSlot.id == bindparam("slot_id"))
+    .where(DiningTableSlot.status == "AVAILABLE")
+    .values(status="HELD")
+    .returning(DiningTableSlot.price_per_table)
+    .execution_options(synchronize_session=False)
+)
+_TABLE_BOOKING_STATE_BY_ID = select(
+    DiningTableBooking.status,
+    DiningTableBooking.order_id,
+    DiningTableBooking.payment_id,
+).where(DiningTableBooking.id == bindparam("booking_id"))
+# The slot comes back in the same locked SELECT (inner join: slot_id is
+# NOT NULL), so verify needs no second lookup.
+_TABLE_BOOKING_WITH_SLOT_FOR_UPDATE = (
+    select(DiningTableBooking)
+    .options(joinedload(DiningTableBooking.slot, innerjoin=True))
+    .where(DiningTableBooking.id == bindparam("booking_id"))
+    .with_for_update()
+)
+
+# Short-lived cache for the listing endpoints that UIs poll. Entries are tagged
+# with the version current when they were loaded, and every commit through
+# get_db bumps it. Cache and version are per process: a write is seen at once
+# by later reads in the same worker, but other workers may serve the old
+# listing for up to READ_CACHE_TTL_SECONDS.
+READ_CACHE_TTL_SECONDS = float(os.getenv("READ_CACHE_TTL_SECONDS", "2"))
+READ_CACHE_MAX_ENTRIES = 256
+_read_cache: dict[tuple, tuple[int, float, object]] = {}
+_read_cache_lock = threading.Lock()
+_read_cache_version = 0
+
+
+def _invalidate_read_cache() -> None:
+    global _read_cache_version
+    with _read_cache_lock:
+        _read_cache_version += 1
+        _read_cache.clear()
+
+
+def _cached_read(key: tuple, load):
+    if READ_CACHE_TTL_SECONDS <= 0:
+        return load()
+
+    now = time.monotonic()
+    with _read_cache_lock:
+        version = _read_cache_version
+        cached = _read_cache.get(key)
+        if cached and cached[0] == version and cached[1] > now:
+            return cached[2]
+
+    value = load()
+    with _read_cache_lock:
+        if version == _read_cache_version:
+            if len(_read_cache) >= READ_CACHE_MAX_ENTRIES:
+                _read_cache.clear()
+            _read_cache[key] = (version, now + READ_CACHE_TTL_SECONDS, value)
+    return value
+
+
+# Negative cache for book_table: slots recently seen HELD/BOOKED fail fast with
+# a 409 instead of queueing on the slot's row lock during a booking rush. It is
+# per-process; a release made by another worker is picked up once the entry
+# expires, so keep the TTL short.
+SLOT_UNAVAILABLE_TTL_SECONDS = float(os.getenv("SLOT_UNAVAILABLE_TTL_SECONDS", "2"))
+SLOT_UNAVAILABLE_MAX_ENTRIES = 4096
+_unavailable_slots: dict[str, float] = {}
+_unavailable_slots_lock = threading.Lock()
+
+
+def _slot_known_unavailable(slot_id: str) -> bool:
+    with _unavailable_slots_lock:
+        expires_at = _unavailable_slots.get(slot_id)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del _unavailable_slots[slot_id]
+            return False
+        return True
+
+
+def _mark_slot_unavailable(slot_id: str) -> None:
+    if SLOT_UNAVAILABLE_TTL_SECONDS <= 0:
+        return
+    with _unavailable_slots_lock:
+        if len(_unavailable_slots) >= SLOT_UNAVAILABLE_MAX_ENTRIES:
+            _unavailable_slots.clear()
+        _unavailable_slots[slot_id] = time.monotonic() + SLOT_UNAVAILABLE_TTL_SECONDS
+
+
+def _forget_slot_unavailable(slot_id: str) -> None:
+    with _unavailable_slots_lock:
+        _unavailable_slots.pop(slot_id, None)
 
 
 def get_db():
+    # Write routes only; reads use get_db_ro.
     db = SessionLocal()
     try:
         yield db
         db.commit()
+        _invalidate_read_cache()
     except Exception:
         db.rollback()
         raise
@@ -79,6 +283,16 @@ def get_db():
         db.close()
 
 
+def get_db_ro():
+    # Nothing to commit on reads; close() hands the connection back and the
+    # pool's reset rolls the transaction back.
+    db = ReadOnlySessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -88,15 +302,24 @@ def _is_db_degraded(exc: Exception) -> bool:
 
 
 def _hash_webhook_payload(request: RazorpayVerifyRequest) -> str:
+    # Must match the hashes already stored in payment_webhook_events, so the
+    # input (sorted-key JSON, default separators) and SHA-256 are fixed.
     payload = {
         "razorpay_order_id": request.razorpay_order_id,
         "razorpay_payment_id": request.razorpay_payment_id,
         "razorpay_signature": request.razorpay_signature,
     }
-    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    encoded = _webhook_payload_encoder.encode(payload).encode("utf-8")
     return hashlib.sha256(encoded).hexdigest()
 
 
+# json.dumps with non-default options builds a new JSONEncoder per call; one
+# shared instance goes straight to the C encoder. Keys stay sorted.
+_outbox_payload_encoder = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+# Same output as json.dumps(payload, sort_keys=True).
+_webhook_payload_encoder = json.JSONEncoder(sort_keys=True)
+
+
 def _add_outbox_event(
     db: Session,
     aggregate_type: str,
@@ -105,23 +328,22 @@ def _add_outbox_event(
     payload: dict,
     dedupe_key: str,
 ) -> None:
-    existing = db.execute(
-        select(OutboxEvent).where(OutboxEvent.dedupe_key == dedupe_key)
-    ).scalar_one_or_none()
-    if existing:
-        return
-
-    db.add(
-        OutboxEvent(
+    # uq_outbox_dedupe_key makes the write idempotent in one statement, with no
+    # SELECT-then-INSERT race.
+    stmt = (
+        pg_insert(OutboxEvent)
+        .values(
             aggregate_type=aggregate_type,
             aggregate_id=aggregate_id,
             event_type=event_type,
-            payload=json.dumps(payload, sort_keys=True),
+            payload=_outbox_payload_encoder.encode(payload),
             dedupe_key=dedupe_key,
             status="PENDING",
             attempts=0,
         )
+        .on_conflict_do_nothing(index_elements=[OutboxEvent.dedupe_key])
     )
+    db.execute(stmt)
 
 
 def _enqueue_deferred_event_booking(event_id: str, request: EventBookingRequest) -> str:
@@ -134,31 +356,25 @@ def _enqueue_deferred_event_booking(event_id: str, request: EventBookingRequest)
         "status": "QUEUED",
         "queued_at": _utc_now_iso(),
     }
-    with _deferred_queue_lock:
-        if len(_deferred_event_booking_queue) >= GRACEFUL_QUEUE_MAX_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Degraded queue is full. Please retry after some time.",
-            )
-        _deferred_event_booking_queue.append(item)
+    if not _deferred_event_booking_queue().enqueue(item):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Degraded queue is full. Please retry after some time.",
+        )
     return request_id
 
 
 def _get_deferred_event_booking(request_id: str) -> dict | None:
-    with _deferred_queue_lock:
-        for item in _deferred_event_booking_queue:
-            if item["request_id"] == request_id:
-                return dict(item)
-    return None
+    return _deferred_event_booking_queue().get(request_id)
 
 
 def _remove_deferred_event_booking(request_id: str) -> None:
-    with _deferred_queue_lock:
-        remaining = [item for item in _deferred_event_booking_queue if item["request_id"] != request_id]
-        _deferred_event_booking_queue.clear()
-        _deferred_event_booking_queue.extend(remaining)
+    _deferred_event_booking_queue().remove(request_id)
 
 
+# One shared client (and its HTTP session) per process, so keep-alive
+# connections to Razorpay are reused. Missing keys raise and are not cached.
+@lru_cache(maxsize=1)
 def _razorpay_client() -> razorpay.Client:
     key_id = os.getenv("RAZORPAY_KEY_ID")
     key_secret = os.getenv("RAZORPAY_KEY_SECRET")
@@ -167,9 +383,12 @@ def _razorpay_client() -> razorpay.Client:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Razorpay keys not configured. Set RAZORPAY_KEY_ID and RAZORPAY_KEY_SECRET.",
         )
-    return razorpay.Client(auth=(key_id, key_secret))
+    session = HTTPSession()
+    session.mount("https://", HTTPAdapter(pool_maxsize=RAZORPAY_HTTP_POOL_SIZE))
+    return razorpay.Client(session=session, auth=(key_id, key_secret))
 
 
+@lru_cache(maxsize=1)
 def _razorpay_key_id() -> str:
     key_id = os.getenv("RAZORPAY_KEY_ID")
     if not key_id:
@@ -180,18 +399,75 @@ def _razorpay_key_id() -> str:
     return key_id
 
 
-def _inventory_stats(inventory: SeatInventory) -> dict:
-    booked_seats = inventory.total_seats - inventory.available_seats
-    return {
-        "event_id": inventory.event_id,
-        "total_seats": inventory.total_seats,
-        "available_seats": inventory.available_seats,
-        "booked_seats": booked_seats,
-    }
+@lru_cache(maxsize=1)
+def _razorpay_key_secret() -> bytes:
+    key_secret = os.getenv("RAZORPAY_KEY_SECRET")
+    if not key_secret:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Razorpay key secret not configured.",
+        )
+    return key_secret.encode()
+
+
+def _verify_payment_signature(request: RazorpayVerifyRequest) -> None:
+    # The SDK's utility.verify_payment_signature, inlined: a local
+    # HMAC-SHA256 of "order_id|payment_id", no client needed. Bytes compare so
+    # a non-ASCII signature fails verification instead of raising TypeError.
+    expected = hmac.new(
+        _razorpay_key_secret(),
+        f"{request.razorpay_order_id}|{request.razorpay_payment_id}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+    if not hmac.compare_digest(expected.encode(), request.razorpay_signature.encode()):
+        raise razorpay.errors.SignatureVerificationError(
+            "Razorpay Signature Verification Failed"
+        )
+
+
+def _after_row(model, after_id: str):
+    # Keyset cursor for listings ordered by (date_time, id): rows strictly
+    # after the row whose id is after_id. Unknown ids match nothing.
+    after_time = (
+        select(model.date_time)
+        .where(model.id == after_id)
+        .scalar_subquery()
+    )
+    return or_(
+        model.date_time > after_time,
+        and_(model.date_time == after_time, model.id > after_id),
+    )
+
+
+def _event_response(event: Event) -> EventResponse:
+    return construct_from_attributes(
+        EventResponse,
+        event,
+        seat_types=[
+            construct_from_attributes(EventSeatTypeResponse, seat)
+            for seat in event.seat_types
+        ],
+    )
+
+
+def _inventory_stats(db: Session, event_id: str | None = None) -> list[dict]:
+    # Read-only: select plain columns (booked_seats computed by the database)
+    # instead of hydrating SeatInventory objects into the identity map.
+    stmt = select(
+        SeatInventory.event_id,
+        SeatInventory.total_seats,
+        SeatInventory.available_seats,
+        (SeatInventory.total_seats - SeatInventory.available_seats).label("booked_seats"),
+    )
+    if event_id:
+        stmt = stmt.where(SeatInventory.event_id == event_id)
+    else:
+        stmt = stmt.order_by(SeatInventory.event_id)
+    return [dict(row) for row in db.execute(stmt).mappings()]
 
 
 def _delete_event_with_dependencies(db: Session, event_id: str) -> bool:
-    event = db.execute(select(Event).where(Event.id == event_id)).scalar_one_or_none()
+    event = db.get(Event, event_id)
     if not event:
         return False
 
@@ -220,42 +496,68 @@ def _delete_event_with_dependencies(db: Session, event_id: str) -> bool:
     return True
 
 
-def _waitlist_position(db: Session, entry: EventWaitlistEntry) -> int:
+def _waitlist_position(db: Session, waitlist_id: str, event_id: str, seat_type: str) -> int:
+    # Count the WAITING entries ahead of this one (ties on created_at broken by
+    # id) so the database returns one number instead of the whole queue.
+    entry_created_at = (
+        select(EventWaitlistEntry.created_at)
+        .where(EventWaitlistEntry.id == waitlist_id)
+        .scalar_subquery()
+    )
     stmt = (
-        select(EventWaitlistEntry)
-        .where(EventWaitlistEntry.event_id == entry.event_id)
-        .where(EventWaitlistEntry.seat_type == entry.seat_type)
+        select(func.count())
+        .select_from(EventWaitlistEntry)
+        .where(EventWaitlistEntry.event_id == event_id)
+        .where(EventWaitlistEntry.seat_type == seat_type)
         .where(EventWaitlistEntry.status == "WAITING")
-        .order_by(EventWaitlistEntry.created_at)
+        .where(
+            or_(
+                EventWaitlistEntry.created_at < entry_created_at,
+                and_(
+                    EventWaitlistEntry.created_at == entry_created_at,
+                    EventWaitlistEntry.id < waitlist_id,
+                ),
+            )
+        )
     )
-    entries = list(db.execute(stmt).scalars().all())
-    for index, item in enumerate(entries, start=1):
-        if item.id == entry.id:
-            return index
-    return len(entries)
+    return db.execute(stmt).scalar_one() + 1
 
 
-def _process_waitlist(db: Session, event_id: str, seat_type_name: str) -> None:
-    seat_stmt = (
-        select(EventSeatType)
-        .where(EventSeatType.event_id == event_id)
-        .where(EventSeatType.seat_type == seat_type_name)
-        .with_for_update()
+def _payment_id_claims(db: Session, booking_model, payment_id: str) -> tuple[str | None, str | None]:
+    # Both idempotency checks on the verify path in one round-trip: the booking
+    # the webhook ledger already recorded for this payment id, and the booking
+    # that already stores it as its payment id.
+    webhook_booking_id = (
+        select(PaymentWebhookEvent.booking_id)
+        .where(PaymentWebhookEvent.provider == "RAZORPAY")
+        .where(PaymentWebhookEvent.payment_id == payment_id)
+        .scalar_subquery()
     )
-    seat_type = db.execute(seat_stmt).scalar_one_or_none()
-    if not seat_type:
+    paid_booking_id = (
+        select(booking_model.id)
+        .where(booking_model.payment_id == payment_id)
+        .scalar_subquery()
+    )
+    row = db.execute(select(webhook_booking_id, paid_booking_id)).one()
+    return row[0], row[1]
+
+
+def _process_waitlist(db: Session, event_id: str, seat_type_name: str) -> None:
+    params = {"event_id": event_id, "seat_type": seat_type_name}
+    seat_type = db.execute(_SEAT_TYPE_FOR_UPDATE, params).scalar_one_or_none()
+    if not seat_type or seat_type.available_seats <= 0:
         return
 
-    waitlist_stmt = (
-        select(EventWaitlistEntry)
-        .where(EventWaitlistEntry.event_id == event_id)
-        .where(EventWaitlistEntry.seat_type == seat_type_name)
-        .where(EventWaitlistEntry.status == "WAITING")
-        .order_by(EventWaitlistEntry.created_at)
-        .with_for_update()
+    # Every entry takes at least one seat, so no more than available_seats
+    # entries can be promoted; lock only that many instead of the whole queue.
+    waitlist_entries = list(
+        db.execute(
+            _WAITING_ENTRIES_FOR_UPDATE,
+            {**params, "limit": seat_type.available_seats},
+        ).scalars().all()
     )
-    waitlist_entries = list(db.execute(waitlist_stmt).scalars().all())
 
+    promoted: list[tuple[EventWaitlistEntry, EventBooking]] = []
     for entry in waitlist_entries:
         if seat_type.available_seats < entry.seat_count:
             break
@@ -271,19 +573,203 @@ def _process_waitlist(db: Session, event_id: str, seat_type_name: str) -> None:
             currency="INR",
         )
         db.add(booking)
-        db.flush()
+        promoted.append((entry, booking))
+
+    if not promoted:
+        return
 
-        client = _razorpay_client()
-        order = client.order.create(
+    db.flush()
+    bookings = [booking for _, booking in promoted]
+    _create_razorpay_orders(bookings)
+    for entry, booking in promoted:
+        entry.status = "READY"
+        entry.booking_id = booking.id
+
+
+def _restored_seat_count(seat_count: int):
+    # Released seats are capped at total_seats, as in
+    # SeatRepository.increment_inventory, so a release never trips
+    # ck_event_available_lte_total.
+    return case(
+        (
+            EventSeatType.available_seats + seat_count > EventSeatType.total_seats,
+            EventSeatType.total_seats,
+        ),
+        else_=EventSeatType.available_seats + seat_count,
+    )
+
+
+def _release_event_seats(db: Session, booking: EventBooking) -> None:
+    # One atomic increment instead of SELECT ... FOR UPDATE plus a
+    # read-modify-write; waitlist promotion only runs if the seat type exists.
+    released = db.execute(
+        update(EventSeatType)
+        .where(EventSeatType.event_id == booking.event_id)
+        .where(EventSeatType.seat_type == booking.seat_type)
+        .values(available_seats=_restored_seat_count(booking.seat_count))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if released:
+        _process_waitlist(db, booking.event_id, booking.seat_type)
+
+
+def _create_razorpay_orders(bookings: list[EventBooking]) -> None:
+    # Orders are independent HTTP calls; issuing them concurrently keeps the
+    # caller's row locks held for about one Razorpay round-trip, not one per booking.
+    client = _razorpay_client()
+
+    def create_order(booking: EventBooking) -> dict:
+        return client.order.create(
             {
-                "amount": amount_paise,
-                "currency": "INR",
+                "amount": booking.amount_paise,
+                "currency": booking.currency,
                 "receipt": booking.id,
             }
         )
+
+    if len(bookings) == 1:
+        orders = [create_order(bookings[0])]
+    else:
+        workers = min(RAZORPAY_ORDER_WORKERS, len(bookings))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            orders = list(executor.map(create_order, bookings))
+
+    for booking, order in zip(bookings, orders):
         booking.order_id = order.get("id")
-        entry.status = "READY"
-        entry.booking_id = booking.id
+
+
+def _release_unordered_event_bookings(db: Session, *criteria) -> int:
+    # Fails the matching PENDING bookings that never got an order (none can
+    # be paid) and hands their seats back. The status/order_id guard makes a
+    # second release of the same booking a no-op, so the failed-order path and
+    # the hold reaper cannot both restore its seats. The waitlist is not
+    # promoted here: that calls Razorpay under the seat-type lock, and WAITING
+    # entries are promoted on the next cancel or failed payment instead.
+    expired = db.execute(
+        update(EventBooking)
+        .where(EventBooking.status == "PENDING")
+        .where(EventBooking.order_id.is_(None))
+        .where(*criteria)
+        .values(status="FAILED")
+        .returning(EventBooking.event_id, EventBooking.seat_type, EventBooking.seat_count)
+        .execution_options(synchronize_session=False)
+    ).all()
+    for event_id, seat_type, seat_count in expired:
+        db.execute(
+            update(EventSeatType)
+            .where(EventSeatType.event_id == event_id)
+            .where(EventSeatType.seat_type == seat_type)
+            .values(available_seats=_restored_seat_count(seat_count))
+            .execution_options(synchronize_session=False)
+        )
+    return len(expired)
+
+
+def _release_unordered_table_bookings(db: Session, *criteria) -> int:
+    # Same guard as _release_unordered_event_bookings; the held slots go back
+    # to AVAILABLE.
+    slot_ids = list(
+        db.execute(
+            update(DiningTableBooking)
+            .where(DiningTableBooking.status == "PENDING")
+            .where(DiningTableBooking.order_id.is_(None))
+            .where(*criteria)
+            .values(status="FAILED")
+            .returning(DiningTableBooking.slot_id)
+            .execution_options(synchronize_session=False)
+        ).scalars()
+    )
+    if slot_ids:
+        db.execute(
+            update(DiningTableSlot)
+            .where(DiningTableSlot.id.in_(slot_ids))
+            .where(DiningTableSlot.status == "HELD")
+            .values(status="AVAILABLE")
+            .execution_options(synchronize_session=False)
+        )
+        for slot_id in slot_ids:
+            _forget_slot_unavailable(slot_id)
+    return len(slot_ids)
+
+
+def _create_order_for_hold(
+    db: Session,
+    booking_model,
+    booking_id: str,
+    amount_paise: int,
+    release,
+) -> str:
+    """
+    Creates the Razorpay order for a booking whose hold is already committed
+    and stores its id. `release(db, *criteria)` hands the hold back if no order
+    can be created.
+    """
+    try:
+        order = _razorpay_client().order.create(
+            {
+                "amount": amount_paise,
+                "currency": "INR",
+                "receipt": booking_id,
+            }
+        )
+    except Exception:
+        # No order means no payment can follow: hand the hold back for good,
+        # since get_db rolls back (not commits) when this request fails. If
+        # the database is what failed, expire_unordered_holds releases it later.
+        try:
+            release(db, booking_model.id == booking_id)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception(
+                "Could not release the hold of booking %s; it is left to expire.",
+                booking_id,
+            )
+        else:
+            _invalidate_read_cache()
+        raise
+
+    order_id = order.get("id")
+    # Committed here rather than by get_db, so the client never receives an
+    # order whose id is not stored. A hold the reaper already expired is no
+    # longer PENDING and must not be revived.
+    recorded = db.execute(
+        update(booking_model)
+        .where(booking_model.id == booking_id)
+        .where(booking_model.status == "PENDING")
+        .values(order_id=order_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not recorded:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The hold for this booking expired before payment could start. Please book again.",
+        )
+    db.commit()
+    return order_id
+
+
+def expire_unordered_holds() -> int:
+    """
+    Releases the holds (event seats, table slots) of PENDING bookings that
+    got no order id within UNORDERED_HOLD_TIMEOUT_SECONDS, e.g. because the
+    request died or the database failed between reserving and storing the
+    order. Returns how many bookings were released.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=UNORDERED_HOLD_TIMEOUT_SECONDS)
+    db = SessionLocal()
+    try:
+        released = _release_unordered_event_bookings(db, EventBooking.created_at < cutoff)
+        released += _release_unordered_table_bookings(db, DiningTableBooking.created_at < cutoff)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    if released:
+        _invalidate_read_cache()
+    return released
 
 
 def _create_event_booking_order(
@@ -291,81 +777,88 @@ def _create_event_booking_order(
     event_id: str,
     request: EventBookingRequest,
 ) -> EventBookingResponse:
-    seat_stmt = (
-        select(EventSeatType)
-        .where(EventSeatType.event_id == event_id)
-        .where(EventSeatType.seat_type == request.seat_type)
-        .with_for_update()
-    )
-    seat_type = db.execute(seat_stmt).scalar_one_or_none()
-    if not seat_type:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Seat type not found",
-        )
-    if seat_type.available_seats < request.seat_count:
+    price = db.execute(
+        _RESERVE_SEATS,
+        {
+            "b_event_id": event_id,
+            "b_seat_type": request.seat_type,
+            "b_seat_count": request.seat_count,
+        },
+    ).scalar_one_or_none()
+    if price is None:
+        seat_type_exists = db.execute(
+            select(EventSeatType.id)
+            .where(EventSeatType.event_id == event_id)
+            .where(EventSeatType.seat_type == request.seat_type)
+        ).first()
+        if not seat_type_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Seat type not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Insufficient seats available",
         )
 
-    amount_paise = seat_type.price * request.seat_count * 100
-    seat_type.available_seats -= request.seat_count
-    booking = EventBooking(
-        event_id=event_id,
-        seat_type=request.seat_type,
-        seat_count=request.seat_count,
-        status="PENDING",
-        amount_paise=amount_paise,
-        currency="INR",
-    )
-    db.add(booking)
-    db.flush()
+    amount_paise = price * request.seat_count * 100
+    booking_id = db.execute(
+        insert(EventBooking)
+        .values(
+            event_id=event_id,
+            seat_type=request.seat_type,
+            seat_count=request.seat_count,
+            status="PENDING",
+            amount_paise=amount_paise,
+            currency="INR",
+        )
+        .returning(EventBooking.id)
+    ).scalar_one()
 
-    client = _razorpay_client()
-    order = client.order.create(
-        {
-            "amount": amount_paise,
-            "currency": "INR",
-            "receipt": booking.id,
-        }
-    )
-    booking.order_id = order.get("id")
+    # Commit the reservation before calling Razorpay so the seat-type row lock
+    # is not held across the external round-trip; other bookers of the same
+    # seat type only wait for the UPDATE above.
+    db.commit()
+    _invalidate_read_cache()
+
+    try:
+        order_id = _create_order_for_hold(
+            db,
+            EventBooking,
+            booking_id,
+            amount_paise,
+            _release_unordered_event_bookings,
+        )
+    except Exception as exc:
+        if not _is_db_degraded(exc):
+            raise
+        # The reservation is already committed, so this must not surface as a
+        # degraded-DB error: book_event would queue a retry that reserves the
+        # seats a second time. Its seats may still be held until the reaper
+        # expires them, so the client is not invited to retry at once.
+        logger.exception("Event booking %s was reserved but could not be completed.", booking_id)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=(
+                "Booking could not be completed. Seats held for it are released "
+                f"within {UNORDERED_HOLD_TIMEOUT_SECONDS:g} seconds."
+            ),
+        ) from exc
 
     return EventBookingResponse(
-        booking_id=booking.id,
-        status=booking.status,
-        order_id=booking.order_id,
+        booking_id=booking_id,
+        status="PENDING",
+        order_id=order_id,
         amount=amount_paise,
         currency="INR",
         key_id=_razorpay_key_id(),
     )
 
 
-@router.get("/", response_class=HTMLResponse)
-def landing_page(
-    request: Request,
-    event_id: str | None = None,
-    db: Session = Depends(get_db),
-):
-    inventories: list[SeatInventory] = []
-
-    if event_id:
-        inventory = SeatRepository(db).get_by_event_id(event_id)
-        if inventory:
-            inventories = [inventory]
-    else:
-        stmt = select(SeatInventory).order_by(SeatInventory.event_id)
-        inventories = list(db.execute(stmt).scalars().all())
-
-    stats = [_inventory_stats(inv) for inv in inventories]
-
-    stmt_events = select(Event).order_by(Event.date_time)
-    events = list(db.execute(stmt_events).scalars().all())
+def _landing_listing(db: Session) -> tuple[list, list]:
+    events = list(db.execute(_EVENTS_WITH_SEAT_TYPES).scalars().all())
     event_cards = []
     for event in events:
-        seat_stmt = select(EventSeatType).where(EventSeatType.event_id == event.id)
-        seat_types = list(db.execute(seat_stmt).scalars().all())
         event_cards.append(
             {
                 "id": event.id,
@@ -380,13 +873,42 @@ def landing_page(
                         "total_seats": seat.total_seats,
                         "available_seats": seat.available_seats,
                     }
-                    for seat in seat_types
+                    for seat in event.seat_types
                 ],
             }
         )
 
-    stmt_tables = select(DiningTableSlot).order_by(DiningTableSlot.date_time)
-    table_slots = list(db.execute(stmt_tables).scalars().all())
+    # Plain rows rather than ORM objects: the result outlives this session
+    # in the read cache.
+    stmt_tables = select(
+        DiningTableSlot.id,
+        DiningTableSlot.restaurant_name,
+        DiningTableSlot.table_number,
+        DiningTableSlot.capacity,
+        DiningTableSlot.price_per_table,
+        DiningTableSlot.date_time,
+        DiningTableSlot.status,
+    ).order_by(DiningTableSlot.date_time)
+    table_slots = [dict(row) for row in db.execute(stmt_tables).mappings()]
+    return event_cards, table_slots
+
+
+@router.get("/", response_class=HTMLResponse)
+def landing_page(
+    request: Request,
+    event_id: str | None = None,
+    db: Session = Depends(get_db_ro),
+):
+    # event_id only filters the inventory stats; the listing is the same for
+    # every event_id, so it is cached (and scanned) once, not per event.
+    stats = _cached_read(
+        ("landing_stats", event_id),
+        lambda: _inventory_stats(db, event_id),
+    )
+    event_cards, table_slots = _cached_read(
+        ("landing",),
+        lambda: _landing_listing(db),
+    )
 
     return templates.TemplateResponse(
         "index.html",
@@ -402,35 +924,35 @@ def landing_page(
 
 @router.get("/events/{event_id}/page", response_class=HTMLResponse)
 def event_detail_page(
-    event_id: str,
+    event_id: UUIDPath,
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_ro),
 ):
-    event = db.execute(select(Event).where(Event.id == event_id)).scalar_one_or_none()
+    event = db.execute(
+        _EVENT_WITH_SEAT_TYPES_BY_ID, {"event_id": event_id}
+    ).scalar_one_or_none()
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found",
         )
-    seat_stmt = select(EventSeatType).where(EventSeatType.event_id == event.id)
-    seat_types = list(db.execute(seat_stmt).scalars().all())
     return templates.TemplateResponse(
         "event_detail.html",
         {
             "request": request,
             "event": event,
-            "seat_types": seat_types,
+            "seat_types": event.seat_types,
         },
     )
 
 
 @router.get("/restaurants/tables/{slot_id}/page", response_class=HTMLResponse)
 def table_detail_page(
-    slot_id: str,
+    slot_id: UUIDPath,
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_ro),
 ):
-    slot = db.execute(select(DiningTableSlot).where(DiningTableSlot.id == slot_id)).scalar_one_or_none()
+    slot = db.get(DiningTableSlot, slot_id)
     if not slot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -446,7 +968,9 @@ def table_detail_page(
 
 
 @router.get("/health")
-def health():
+async def health():
+    # No I/O: served on the event loop, so health checks still answer while
+    # every worker thread is busy with database-bound routes.
     return {"message": "District Integrity Engine is running"}
 
 
@@ -454,7 +978,7 @@ def health():
 def list_outbox_events(
     status_filter: str = "PENDING",
     limit: int = 50,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_ro),
 ):
     safe_limit = max(1, min(limit, 200))
     stmt = (
@@ -463,203 +987,162 @@ def list_outbox_events(
         .order_by(OutboxEvent.created_at)
         .limit(safe_limit)
     )
-    events = list(db.execute(stmt).scalars().all())
-    return [
-        OutboxEventResponse(
-            id=item.id,
-            aggregate_type=item.aggregate_type,
-            aggregate_id=item.aggregate_id,
-            event_type=item.event_type,
-            status=item.status,
-            attempts=item.attempts,
-            created_at=item.created_at.isoformat(),
-        )
-        for item in events
-    ]
+    return [construct_from_attributes(OutboxEventResponse, item) for item in db.execute(stmt).scalars()]
+
+
+@router.post("/outbox/events/claim", response_model=list[OutboxEventResponse])
+def claim_outbox_events(
+    limit: int = 50,
+    db: Session = Depends(get_db),
+):
+    # For publishers: takes a batch of pending events off the queue so that
+    # concurrent workers never pick up the same event. Events whose claim
+    # outlived OUTBOX_CLAIM_LEASE_SECONDS are claimed again.
+    safe_limit = max(1, min(limit, 200))
+    claimed = OutboxRepository(db).claim_batch(safe_limit, OUTBOX_CLAIM_LEASE_SECONDS)
+    return [construct_from_attributes(OutboxEventResponse, item) for item in claimed]
+
+
+@router.post("/outbox/events/{event_id}/release", response_model=OutboxEventResponse)
+def release_outbox_event(
+    event_id: UUIDPath,
+    request: OutboxEventReleaseRequest,
+    db: Session = Depends(get_db),
+):
+    # For publishers that could not deliver a claimed event: it goes back to
+    # PENDING at once instead of waiting out the lease.
+    item = db.get(OutboxEvent, event_id)
+    if not item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Outbox event not found",
+        )
+    if item.status != "IN_FLIGHT":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Cannot release outbox event in status {item.status}.",
+        )
+
+    item.status = "PENDING"
+    item.claimed_at = None
+    item.last_error = request.error
+    return construct_from_attributes(OutboxEventResponse, item)
 
 
 @router.post("/outbox/events/{event_id}/mark-published", response_model=OutboxEventResponse)
 def mark_outbox_event_published(
-    event_id: str,
+    event_id: UUIDPath,
     db: Session = Depends(get_db),
 ):
-    item = db.execute(select(OutboxEvent).where(OutboxEvent.id == event_id)).scalar_one_or_none()
+    item = db.get(OutboxEvent, event_id)
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Outbox event not found",
         )
 
+    # A claimed event already counted its attempt when it was claimed.
+    if item.status != "IN_FLIGHT":
+        item.attempts += 1
     item.status = "PUBLISHED"
     item.published_at = datetime.now(timezone.utc)
-    item.attempts += 1
-    return OutboxEventResponse(
-        id=item.id,
-        aggregate_type=item.aggregate_type,
-        aggregate_id=item.aggregate_id,
-        event_type=item.event_type,
-        status=item.status,
-        attempts=item.attempts,
-        created_at=item.created_at.isoformat(),
-    )
+    return construct_from_attributes(OutboxEventResponse, item)
 
 
-@router.get("/inventory")
-def list_inventory(db: Session = Depends(get_db)):
-    stmt = select(SeatInventory).order_by(SeatInventory.event_id)
-    inventories = list(db.execute(stmt).scalars().all())
-    return [_inventory_stats(inv) for inv in inventories]
+@router.get("/inventory", response_model=list[InventoryStatsResponse])
+def list_inventory(db: Session = Depends(get_db_ro)):
+    # Rows are plain typed columns from our own SELECT, so the response models
+    # are built without re-validating each field.
+    return _cached_read(
+        ("inventory",),
+        lambda: [InventoryStatsResponse.model_construct(**row) for row in _inventory_stats(db)],
+    )
 
 
-@router.get("/inventory/{event_id}")
-def get_inventory(event_id: str, db: Session = Depends(get_db)):
-    inventory = SeatRepository(db).get_by_event_id(event_id)
-    if not inventory:
+@router.get("/inventory/{event_id}", response_model=InventoryStatsResponse)
+def get_inventory(event_id: str, db: Session = Depends(get_db_ro)):
+    stats = _inventory_stats(db, event_id)
+    if not stats:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Inventory not found",
         )
-    return _inventory_stats(inventory)
+    return InventoryStatsResponse.model_construct(**stats[0])
 
 
 @router.get("/events", response_model=list[EventResponse])
-def list_events(db: Session = Depends(get_db)):
-    stmt = select(Event).order_by(Event.date_time)
-    events = list(db.execute(stmt).scalars().all())
-    results = []
-    for event in events:
-        seat_stmt = select(EventSeatType).where(EventSeatType.event_id == event.id)
-        seat_types = list(db.execute(seat_stmt).scalars().all())
-        results.append(
-            EventResponse(
-                id=event.id,
-                title=event.title,
-                type=event.type,
-                date_time=event.date_time.isoformat(),
-                location=event.location,
-                seat_types=[
-                    EventSeatTypeResponse(
-                        seat_type=seat.seat_type,
-                        price=seat.price,
-                        total_seats=seat.total_seats,
-                        available_seats=seat.available_seats,
-                    )
-                    for seat in seat_types
-                ],
-            )
-        )
-    return results
+def list_events(
+    limit: int | None = None,
+    after: UUIDCursor = None,
+    db: Session = Depends(get_db_ro),
+):
+    # Unpaginated unless asked, for existing clients; pass the last event's id
+    # as `after` to fetch the next page.
+    safe_limit = max(1, min(limit, 1000)) if limit is not None else None
+    stmt = _EVENTS_WITH_SEAT_TYPES
+    if after:
+        stmt = stmt.where(_after_row(Event, after))
+    if safe_limit is not None:
+        stmt = stmt.limit(safe_limit)
+    return _cached_read(
+        ("events", safe_limit, after),
+        lambda: [
+            _event_response(event)
+            for event in db.execute(stmt).scalars()
+        ],
+    )
 
 
 @router.post("/events", response_model=EventResponse)
 def create_event(request: EventCreate, db: Session = Depends(get_db)):
-    try:
-        event_time = datetime.fromisoformat(request.date_time)
-    except ValueError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid date_time format. Use ISO format.",
-        ) from exc
-
     existing_event = db.execute(
         select(Event)
+        .options(selectinload(Event.seat_types))
         .where(Event.title == request.title)
         .where(Event.type == request.type)
-        .where(Event.date_time == event_time)
+        .where(Event.date_time == request.date_time)
         .where(Event.location == request.location)
     ).scalar_one_or_none()
 
     if existing_event:
-        seat_stmt = select(EventSeatType).where(EventSeatType.event_id == existing_event.id)
-        existing_seat_types = list(db.execute(seat_stmt).scalars().all())
-        return EventResponse(
-            id=existing_event.id,
-            title=existing_event.title,
-            type=existing_event.type,
-            date_time=existing_event.date_time.isoformat(),
-            location=existing_event.location,
-            seat_types=[
-                EventSeatTypeResponse(
-                    seat_type=seat.seat_type,
-                    price=seat.price,
-                    total_seats=seat.total_seats,
-                    available_seats=seat.available_seats,
-                )
-                for seat in existing_seat_types
-            ],
-        )
+        return _event_response(existing_event)
 
     event = Event(
         title=request.title,
         type=request.type,
-        date_time=event_time,
+        date_time=request.date_time,
         location=request.location,
-    )
-    db.add(event)
-    db.flush()
-
-    seat_types = []
-    for seat in request.seat_types:
-        seat_type = EventSeatType(
-            event_id=event.id,
-            seat_type=seat.seat_type,
-            price=seat.price,
-            total_seats=seat.total_seats,
-            available_seats=seat.total_seats,
-        )
-        db.add(seat_type)
-        seat_types.append(seat_type)
-
-    db.flush()
-
-    return EventResponse(
-        id=event.id,
-        title=event.title,
-        type=event.type,
-        date_time=event.date_time.isoformat(),
-        location=event.location,
         seat_types=[
-            EventSeatTypeResponse(
+            EventSeatType(
                 seat_type=seat.seat_type,
                 price=seat.price,
                 total_seats=seat.total_seats,
-                available_seats=seat.available_seats,
+                available_seats=seat.total_seats,
             )
-            for seat in seat_types
+            for seat in request.seat_types
         ],
     )
+    db.add(event)
+    db.flush()
+
+    return _event_response(event)
 
 
 @router.get("/events/{event_id}", response_model=EventResponse)
-def get_event(event_id: str, db: Session = Depends(get_db)):
-    event = db.execute(select(Event).where(Event.id == event_id)).scalar_one_or_none()
+def get_event(event_id: UUIDPath, db: Session = Depends(get_db_ro)):
+    event = db.execute(
+        _EVENT_WITH_SEAT_TYPES_BY_ID, {"event_id": event_id}
+    ).scalar_one_or_none()
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found",
         )
-    seat_stmt = select(EventSeatType).where(EventSeatType.event_id == event.id)
-    seat_types = list(db.execute(seat_stmt).scalars().all())
-    return EventResponse(
-        id=event.id,
-        title=event.title,
-        type=event.type,
-        date_time=event.date_time.isoformat(),
-        location=event.location,
-        seat_types=[
-            EventSeatTypeResponse(
-                seat_type=seat.seat_type,
-                price=seat.price,
-                total_seats=seat.total_seats,
-                available_seats=seat.available_seats,
-            )
-            for seat in seat_types
-        ],
-    )
+    return _event_response(event)
 
 
 @router.delete("/events/{event_id}")
-def delete_event(event_id: str, db: Session = Depends(get_db)):
+def delete_event(event_id: UUIDPath, db: Session = Depends(get_db)):
     deleted = _delete_event_with_dependencies(db=db, event_id=event_id)
     if not deleted:
         raise HTTPException(
@@ -700,7 +1183,7 @@ def dedupe_events(db: Session = Depends(get_db)):
     response_model=EventBookingResponse | DeferredEventBookingResponse,
 )
 def book_event(
-    event_id: str,
+    event_id: UUIDPath,
     request: EventBookingRequest,
     db: Session = Depends(get_db),
 ):
@@ -730,8 +1213,7 @@ def book_event(
     response_model=list[DeferredEventBookingStatusResponse],
 )
 def list_deferred_event_bookings():
-    with _deferred_queue_lock:
-        items = [dict(item) for item in _deferred_event_booking_queue]
+    items = _deferred_event_booking_queue().list()
     return [
         DeferredEventBookingStatusResponse(
             request_id=item["request_id"],
@@ -790,7 +1272,7 @@ def retry_deferred_event_booking(
 
 @router.post("/events/{event_id}/waitlist", response_model=EventWaitlistJoinResponse)
 def join_event_waitlist(
-    event_id: str,
+    event_id: UUIDPath,
     request: EventWaitlistJoinRequest,
     db: Session = Depends(get_db),
 ):
@@ -811,32 +1293,34 @@ def join_event_waitlist(
             detail="Seats are available. Please book directly.",
         )
 
-    entry = EventWaitlistEntry(
-        event_id=event_id,
-        seat_type=request.seat_type,
-        seat_count=request.seat_count,
-        status="WAITING",
-    )
-    db.add(entry)
-    db.flush()
+    # Nothing reads the new entry back as an object, so it skips the
+    # unit-of-work and identity map: one INSERT ... RETURNING id.
+    waitlist_id = db.execute(
+        insert(EventWaitlistEntry)
+        .values(
+            event_id=event_id,
+            seat_type=request.seat_type,
+            seat_count=request.seat_count,
+            status="WAITING",
+        )
+        .returning(EventWaitlistEntry.id)
+    ).scalar_one()
 
-    position = _waitlist_position(db, entry)
+    position = _waitlist_position(db, waitlist_id, event_id, request.seat_type)
     return EventWaitlistJoinResponse(
-        waitlist_id=entry.id,
-        status=entry.status,
+        waitlist_id=waitlist_id,
+        status="WAITING",
         position=position,
     )
 
 
 @router.get("/events/waitlist/{waitlist_id}/page", response_class=HTMLResponse)
 def waitlist_status_page(
-    waitlist_id: str,
+    waitlist_id: UUIDPath,
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_ro),
 ):
-    entry = db.execute(
-        select(EventWaitlistEntry).where(EventWaitlistEntry.id == waitlist_id)
-    ).scalar_one_or_none()
+    entry = db.get(EventWaitlistEntry, waitlist_id)
     if not entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -845,9 +1329,9 @@ def waitlist_status_page(
 
     position = None
     if entry.status == "WAITING":
-        position = _waitlist_position(db, entry)
+        position = _waitlist_position(db, entry.id, entry.event_id, entry.seat_type)
 
-    event = db.execute(select(Event).where(Event.id == entry.event_id)).scalar_one_or_none()
+    event = db.get(Event, entry.event_id)
     return templates.TemplateResponse(
         "waitlist_status.html",
         {
@@ -861,12 +1345,10 @@ def waitlist_status_page(
 
 @router.post("/events/waitlist/{waitlist_id}/initiate", response_model=EventBookingResponse)
 def initiate_waitlist_payment(
-    waitlist_id: str,
+    waitlist_id: UUIDPath,
     db: Session = Depends(get_db),
 ):
-    entry = db.execute(
-        select(EventWaitlistEntry).where(EventWaitlistEntry.id == waitlist_id)
-    ).scalar_one_or_none()
+    entry = db.get(EventWaitlistEntry, waitlist_id)
     if not entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -878,9 +1360,7 @@ def initiate_waitlist_payment(
             detail="Waitlist entry is not ready for payment yet.",
         )
 
-    booking = db.execute(
-        select(EventBooking).where(EventBooking.id == entry.booking_id)
-    ).scalar_one_or_none()
+    booking = db.get(EventBooking, entry.booking_id)
     if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -903,15 +1383,65 @@ def initiate_waitlist_payment(
     )
 
 
+_PAYMENT_ID_CONFLICTS = {
+    "uq_webhook_provider_payment_id": "Payment id already linked with another booking.",
+    "uq_dining_booking_payment_id": "Payment id already consumed by another booking.",
+}
+
+
+def _constraint_name(exc: IntegrityError) -> str | None:
+    # psycopg2/psycopg expose the violated constraint; other drivers do not.
+    diag = getattr(exc.orig, "diag", None)
+    return getattr(diag, "constraint_name", None)
+
+
+def _record_payment_webhook(
+    db: Session,
+    request: RazorpayVerifyRequest,
+    booking_type: str,
+    booking_id: str,
+) -> None:
+    # Plain Core INSERT: the ledger row is never read back in the request.
+    # Raises IntegrityError right here if the payment id is already recorded.
+    db.execute(
+        insert(PaymentWebhookEvent).values(
+            provider="RAZORPAY",
+            payment_id=request.razorpay_payment_id,
+            booking_type=booking_type,
+            booking_id=booking_id,
+            payload_hash=_hash_webhook_payload(request),
+            status="PROCESSED",
+        )
+    )
+
+
+def _compare_and_set_event_booking(db: Session, booking: EventBooking, **values) -> bool:
+    # Optimistic concurrency for verify instead of holding FOR UPDATE on the
+    # booking: the UPDATE applies only if status and payment_id are still what
+    # this request read, and reports whether it won.
+    payment_id_unchanged = (
+        EventBooking.payment_id.is_(None)
+        if booking.payment_id is None
+        else EventBooking.payment_id == booking.payment_id
+    )
+    result = db.execute(
+        update(EventBooking)
+        .where(EventBooking.id == booking.id)
+        .where(EventBooking.status == booking.status)
+        .where(payment_id_unchanged)
+        .values(**values)
+        .execution_options(synchronize_session="evaluate")
+    )
+    return result.rowcount == 1
+
+
 @router.post("/events/bookings/{booking_id}/verify", response_model=EventBookingResponse)
 def verify_event_booking(
-    booking_id: str,
+    booking_id: UUIDPath,
     request: RazorpayVerifyRequest,
     db: Session = Depends(get_db),
 ):
-    booking = db.execute(
-        select(EventBooking).where(EventBooking.id == booking_id).with_for_update()
-    ).scalar_one_or_none()
+    booking = db.get(EventBooking, booking_id)
     if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -933,47 +1463,31 @@ def verify_event_booking(
             status=booking.status,
         )
 
-    existing_webhook = db.execute(
-        select(PaymentWebhookEvent)
-        .where(PaymentWebhookEvent.provider == "RAZORPAY")
-        .where(PaymentWebhookEvent.payment_id == request.razorpay_payment_id)
-    ).scalar_one_or_none()
-    if existing_webhook and existing_webhook.booking_id != booking.id:
+    webhook_booking_id, paid_booking_id = _payment_id_claims(
+        db, EventBooking, request.razorpay_payment_id
+    )
+    if webhook_booking_id and webhook_booking_id != booking.id:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Payment id already linked with another booking.",
         )
 
-    existing_paid_booking = db.execute(
-        select(EventBooking).where(EventBooking.payment_id == request.razorpay_payment_id)
-    ).scalar_one_or_none()
-    if existing_paid_booking and existing_paid_booking.id != booking.id:
+    if paid_booking_id and paid_booking_id != booking.id:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Payment id already consumed by another booking.",
         )
 
-    client = _razorpay_client()
     try:
-        client.utility.verify_payment_signature(
-            {
-                "razorpay_order_id": request.razorpay_order_id,
-                "razorpay_payment_id": request.razorpay_payment_id,
-                "razorpay_signature": request.razorpay_signature,
-            }
-        )
+        _verify_payment_signature(request)
     except razorpay.errors.SignatureVerificationError as exc:
-        booking.status = "FAILED"
-        seat_stmt = (
-            select(EventSeatType)
-            .where(EventSeatType.event_id == booking.event_id)
-            .where(EventSeatType.seat_type == booking.seat_type)
-            .with_for_update()
-        )
-        seat_type = db.execute(seat_stmt).scalar_one_or_none()
-        if seat_type:
-            seat_type.available_seats += booking.seat_count
-            _process_waitlist(db, booking.event_id, booking.seat_type)
+        if not _compare_and_set_event_booking(db, booking, status="FAILED"):
+            # A concurrent verify already moved the booking on; leave it be.
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid payment signature",
+            ) from exc
+        _release_event_seats(db, booking)
         _add_outbox_event(
             db=db,
             aggregate_type="event_booking",
@@ -988,27 +1502,42 @@ def verify_event_booking(
             },
             dedupe_key=f"event_booking:{booking.id}:payment_failed:{request.razorpay_payment_id}",
         )
-        db.flush()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid payment signature",
         ) from exc
 
-    if not existing_webhook:
-        db.add(
-            PaymentWebhookEvent(
-                provider="RAZORPAY",
-                payment_id=request.razorpay_payment_id,
-                booking_type="EVENT_BOOKING",
+    try:
+        won = _compare_and_set_event_booking(
+            db,
+            booking,
+            status="SUCCESS",
+            payment_id=request.razorpay_payment_id,
+            payment_signature=request.razorpay_signature,
+        )
+        if won and not webhook_booking_id:
+            _record_payment_webhook(db, request, "EVENT_BOOKING", booking.id)
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Duplicate webhook delivery detected for this payment.",
+        ) from exc
+
+    if not won:
+        # Lost the race to a concurrent verify: succeed only if it confirmed
+        # this same payment.
+        db.refresh(booking)
+        if booking.status == "SUCCESS" and booking.payment_id == request.razorpay_payment_id:
+            return EventBookingResponse(
                 booking_id=booking.id,
-                payload_hash=_hash_webhook_payload(request),
-                status="PROCESSED",
+                status=booking.status,
             )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Booking was updated concurrently; retry verification.",
         )
 
-    booking.status = "SUCCESS"
-    booking.payment_id = request.razorpay_payment_id
-    booking.payment_signature = request.razorpay_signature
     _add_outbox_event(
         db=db,
         aggregate_type="event_booking",
@@ -1025,14 +1554,6 @@ def verify_event_booking(
         },
         dedupe_key=f"event_booking:{booking.id}:payment_success:{request.razorpay_payment_id}",
     )
-    try:
-        db.flush()
-    except IntegrityError as exc:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Duplicate webhook delivery detected for this payment.",
-        ) from exc
 
     return EventBookingResponse(
         booking_id=booking.id,
@@ -1042,12 +1563,10 @@ def verify_event_booking(
 
 @router.post("/events/bookings/{booking_id}/cancel", response_model=EventBookingResponse)
 def cancel_event_booking(
-    booking_id: str,
+    booking_id: UUIDPath,
     db: Session = Depends(get_db),
 ):
-    booking = db.execute(
-        select(EventBooking).where(EventBooking.id == booking_id)
-    ).scalar_one_or_none()
+    booking = db.get(EventBooking, booking_id)
     if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1060,16 +1579,7 @@ def cancel_event_booking(
             detail=f"Cannot cancel booking in status {booking.status}.",
         )
 
-    seat_stmt = (
-        select(EventSeatType)
-        .where(EventSeatType.event_id == booking.event_id)
-        .where(EventSeatType.seat_type == booking.seat_type)
-        .with_for_update()
-    )
-    seat_type = db.execute(seat_stmt).scalar_one_or_none()
-    if seat_type:
-        seat_type.available_seats += booking.seat_count
-        _process_waitlist(db, booking.event_id, booking.seat_type)
+    _release_event_seats(db, booking)
 
     booking.status = "CANCELLED"
     _add_outbox_event(
@@ -1085,7 +1595,6 @@ def cancel_event_booking(
         },
         dedupe_key=f"event_booking:{booking.id}:cancelled",
     )
-    db.flush()
     return EventBookingResponse(
         booking_id=booking.id,
         status=booking.status,
@@ -1093,21 +1602,34 @@ def cancel_event_booking(
 
 
 @router.get("/restaurants/tables", response_model=list[DiningTableSlotResponse])
-def list_table_slots(db: Session = Depends(get_db)):
-    stmt = select(DiningTableSlot).order_by(DiningTableSlot.date_time)
-    slots = list(db.execute(stmt).scalars().all())
-    return [
-        DiningTableSlotResponse(
-            id=slot.id,
-            restaurant_name=slot.restaurant_name,
-            table_number=slot.table_number,
-            capacity=slot.capacity,
-            price_per_table=slot.price_per_table,
-            date_time=slot.date_time.isoformat(),
-            status=slot.status,
-        )
-        for slot in slots
-    ]
+def list_table_slots(
+    limit: int = 100,
+    offset: int = 0,
+    after: UUIDCursor = None,
+    db: Session = Depends(get_db_ro),
+):
+    safe_limit = max(1, min(limit, 1000))
+    safe_offset = max(0, offset)
+    stmt = (
+        select(
+            DiningTableSlot.id,
+            DiningTableSlot.restaurant_name,
+            DiningTableSlot.table_number,
+            DiningTableSlot.capacity,
+            DiningTableSlot.price_per_table,
+            DiningTableSlot.date_time,
+            DiningTableSlot.status,
+        )
+        .order_by(DiningTableSlot.date_time, DiningTableSlot.id)
+        .limit(safe_limit)
+        .offset(safe_offset)
+    )
+    if after:
+        stmt = stmt.where(_after_row(DiningTableSlot, after))
+    return _cached_read(
+        ("table_slots", safe_limit, safe_offset, after),
+        lambda: [DiningTableSlotResponse.model_construct(**row) for row in db.execute(stmt).mappings()],
+    )
 
 
 @router.post("/restaurants/tables", response_model=DiningTableSlotResponse)
@@ -1115,79 +1637,86 @@ def create_table_slot(
     request: DiningTableSlotCreate,
     db: Session = Depends(get_db),
 ):
-    try:
-        slot_time = datetime.fromisoformat(request.date_time)
-    except ValueError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid date_time format. Use ISO format.",
-        ) from exc
-
     slot = DiningTableSlot(
         restaurant_name=request.restaurant_name,
         table_number=request.table_number,
         capacity=request.capacity,
         price_per_table=request.price_per_table,
-        date_time=slot_time,
+        date_time=request.date_time,
         status="AVAILABLE",
     )
     db.add(slot)
-    db.flush()
+    # Flush here so uq_restaurant_table_timeslot is checked before we answer,
+    # not at get_db's commit after the response has gone out.
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Table slot already exists for this restaurant, table and time.",
+        ) from exc
 
-    return DiningTableSlotResponse(
-        id=slot.id,
-        restaurant_name=slot.restaurant_name,
-        table_number=slot.table_number,
-        capacity=slot.capacity,
-        price_per_table=slot.price_per_table,
-        date_time=slot.date_time.isoformat(),
-        status=slot.status,
-    )
+    return construct_from_attributes(DiningTableSlotResponse, slot)
 
 
 @router.post("/restaurants/tables/{slot_id}/book", response_model=DiningTableBookingResponse)
 def book_table(
-    slot_id: str,
+    slot_id: UUIDPath,
     db: Session = Depends(get_db),
 ):
-    slot_stmt = select(DiningTableSlot).where(DiningTableSlot.id == slot_id).with_for_update()
-    slot = db.execute(slot_stmt).scalar_one_or_none()
-    if not slot:
+    if _slot_known_unavailable(slot_id):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Table slot not found",
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Table slot not available",
         )
-    if slot.status != "AVAILABLE":
+
+    price_per_table = db.execute(_HOLD_TABLE_SLOT, {"slot_id": slot_id}).scalar_one_or_none()
+    if price_per_table is None:
+        slot_exists = db.execute(
+            select(DiningTableSlot.id).where(DiningTableSlot.id == slot_id)
+        ).first()
+        if not slot_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Table slot not found",
+            )
+        _mark_slot_unavailable(slot_id)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Table slot not available",
         )
 
-    amount_paise = slot.price_per_table * 100
-    slot.status = "HELD"
-    booking = DiningTableBooking(
-        slot_id=slot.id,
-        status="PENDING",
-        amount_paise=amount_paise,
-        currency="INR",
-    )
-    db.add(booking)
-    db.flush()
-
-    client = _razorpay_client()
-    order = client.order.create(
-        {
-            "amount": amount_paise,
-            "currency": "INR",
-            "receipt": booking.id,
-        }
+    amount_paise = price_per_table * 100
+    booking_id = db.execute(
+        insert(DiningTableBooking)
+        .values(
+            slot_id=slot_id,
+            status="PENDING",
+            amount_paise=amount_paise,
+            currency="INR",
+        )
+        .returning(DiningTableBooking.id)
+    ).scalar_one()
+
+    # Commit the hold before calling Razorpay so the slot row lock is not held
+    # across the external round-trip; HELD already keeps other bookers out.
+    db.commit()
+    _invalidate_read_cache()
+    _mark_slot_unavailable(slot_id)
+
+    order_id = _create_order_for_hold(
+        db,
+        DiningTableBooking,
+        booking_id,
+        amount_paise,
+        _release_unordered_table_bookings,
     )
-    booking.order_id = order.get("id")
 
     return DiningTableBookingResponse(
-        booking_id=booking.id,
-        status=booking.status,
-        order_id=booking.order_id,
+        booking_id=booking_id,
+        status="PENDING",
+        order_id=order_id,
         amount=amount_paise,
         currency="INR",
         key_id=_razorpay_key_id(),
@@ -1196,12 +1725,25 @@ def book_table(
 
 @router.post("/restaurants/bookings/{booking_id}/verify", response_model=DiningTableBookingResponse)
 def verify_table_booking(
-    booking_id: str,
+    booking_id: UUIDPath,
     request: RazorpayVerifyRequest,
     db: Session = Depends(get_db),
 ):
+    # Most deliveries are replays of a payment already confirmed. SUCCESS is
+    # final, so answer those from a plain read without queueing on the row lock.
+    current = db.execute(
+        _TABLE_BOOKING_STATE_BY_ID, {"booking_id": booking_id}
+    ).one_or_none()
+    if (
+        current
+        and current.status == "SUCCESS"
+        and current.order_id == request.razorpay_order_id
+        and current.payment_id == request.razorpay_payment_id
+    ):
+        return DiningTableBookingResponse(booking_id=booking_id, status=current.status)
+
     booking = db.execute(
-        select(DiningTableBooking).where(DiningTableBooking.id == booking_id).with_for_update()
+        _TABLE_BOOKING_WITH_SLOT_FOR_UPDATE, {"booking_id": booking_id}
     ).scalar_one_or_none()
     if not booking:
         raise HTTPException(
@@ -1224,42 +1766,14 @@ def verify_table_booking(
             status=booking.status,
         )
 
-    existing_webhook = db.execute(
-        select(PaymentWebhookEvent)
-        .where(PaymentWebhookEvent.provider == "RAZORPAY")
-        .where(PaymentWebhookEvent.payment_id == request.razorpay_payment_id)
-    ).scalar_one_or_none()
-    if existing_webhook and existing_webhook.booking_id != booking.id:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Payment id already linked with another booking.",
-        )
-
-    existing_paid_booking = db.execute(
-        select(DiningTableBooking).where(DiningTableBooking.payment_id == request.razorpay_payment_id)
-    ).scalar_one_or_none()
-    if existing_paid_booking and existing_paid_booking.id != booking.id:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Payment id already consumed by another booking.",
-        )
-
-    client = _razorpay_client()
+    # No duplicate payment-id pre-checks here: the unique constraints on the
+    # webhook ledger and on dining_table_bookings.payment_id reject a reused
+    # payment id at flush time, and the IntegrityError is mapped to a 409 below.
     try:
-        client.utility.verify_payment_signature(
-            {
-                "razorpay_order_id": request.razorpay_order_id,
-                "razorpay_payment_id": request.razorpay_payment_id,
-                "razorpay_signature": request.razorpay_signature,
-            }
-        )
+        _verify_payment_signature(request)
     except razorpay.errors.SignatureVerificationError as exc:
         booking.status = "FAILED"
-        slot = db.execute(
-            select(DiningTableSlot).where(DiningTableSlot.id == booking.slot_id)
-        ).scalar_one_or_none()
-        if slot:
-            slot.status = "AVAILABLE"
+        booking.slot.status = "AVAILABLE"
         _add_outbox_event(
             db=db,
             aggregate_type="dining_booking",
@@ -1273,32 +1787,30 @@ def verify_table_booking(
             },
             dedupe_key=f"dining_booking:{booking.id}:payment_failed:{request.razorpay_payment_id}",
         )
-        db.flush()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid payment signature",
         ) from exc
 
-    if not existing_webhook:
-        db.add(
-            PaymentWebhookEvent(
-                provider="RAZORPAY",
-                payment_id=request.razorpay_payment_id,
-                booking_type="DINING_BOOKING",
-                booking_id=booking.id,
-                payload_hash=_hash_webhook_payload(request),
-                status="PROCESSED",
-            )
-        )
-
     booking.status = "SUCCESS"
     booking.payment_id = request.razorpay_payment_id
     booking.payment_signature = request.razorpay_signature
-    slot = db.execute(
-        select(DiningTableSlot).where(DiningTableSlot.id == booking.slot_id)
-    ).scalar_one_or_none()
-    if slot:
-        slot.status = "BOOKED"
+    booking.slot.status = "BOOKED"
+    try:
+        # A ledger row for this payment can only exist for a booking already
+        # in SUCCESS with it (both are written together), which returned above.
+        _record_payment_webhook(db, request, "DINING_BOOKING", booking.id)
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=_PAYMENT_ID_CONFLICTS.get(
+                _constraint_name(exc),
+                "Duplicate webhook delivery detected for this payment.",
+            ),
+        ) from exc
+
     _add_outbox_event(
         db=db,
         aggregate_type="dining_booking",
@@ -1313,14 +1825,6 @@ def verify_table_booking(
         },
         dedupe_key=f"dining_booking:{booking.id}:payment_success:{request.razorpay_payment_id}",
     )
-    try:
-        db.flush()
-    except IntegrityError as exc:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Duplicate webhook delivery detected for this payment.",
-        ) from exc
 
     return DiningTableBookingResponse(
         booking_id=booking.id,
@@ -1389,7 +1893,7 @@ def create_booking(
 
 @router.post("/bookings/{booking_id}/pay", response_model=BookingResponse)
 def pay_booking(
-    booking_id: str,
+    booking_id: UUIDPath,
     request: PaymentRequest,
     db: Session = Depends(get_db),
 ):
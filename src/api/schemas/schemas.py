@@ -1,5 +1,23 @@
-from typing import Literal
-from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Any, Literal, TypeVar
+from pydantic import BaseModel, ConfigDict, Field
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def construct_from_attributes(model_cls: type[ModelT], obj: Any, **overrides: Any) -> ModelT:
+    """
+    Builds a response model from an ORM row we loaded ourselves without
+    validating it: the columns already have the response types, so the
+    from_attributes model_validate() pass only re-checks them.
+    """
+    values = {
+        name: getattr(obj, name)
+        for name in model_cls.model_fields
+        if name not in overrides
+    }
+    return model_cls.model_construct(**values, **overrides)
 
 
 class BookingRequest(BaseModel):
@@ -19,6 +37,13 @@ class SeedInventoryRequest(BaseModel):
     total_seats: int = Field(ge=0)
 
 
+class InventoryStatsResponse(BaseModel):
+    event_id: str
+    total_seats: int
+    available_seats: int
+    booked_seats: int
+
+
 class PaymentRequest(BaseModel):
     result: Literal["success", "failed"]
 
@@ -32,12 +57,14 @@ class EventSeatTypeCreate(BaseModel):
 class EventCreate(BaseModel):
     title: str
     type: str
-    date_time: str
+    date_time: datetime
     location: str
     seat_types: list[EventSeatTypeCreate]
 
 
 class EventSeatTypeResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     seat_type: str
     price: int
     total_seats: int
@@ -45,10 +72,12 @@ class EventSeatTypeResponse(BaseModel):
 
 
 class EventResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     title: str
     type: str
-    date_time: str
+    date_time: datetime
     location: str
     seat_types: list[EventSeatTypeResponse]
 
@@ -90,16 +119,18 @@ class DiningTableSlotCreate(BaseModel):
     table_number: str
     capacity: int = Field(gt=0)
     price_per_table: int = Field(ge=0)
-    date_time: str
+    date_time: datetime
 
 
 class DiningTableSlotResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     restaurant_name: str
     table_number: str
     capacity: int
     price_per_table: int
-    date_time: str
+    date_time: datetime
     status: str
 
 
@@ -130,14 +161,22 @@ class DeferredEventBookingStatusResponse(BaseModel):
     seat_type: str
     seat_count: int
     status: str
-    queued_at: str
+    queued_at: datetime
 
 
 class OutboxEventResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     aggregate_type: str
     aggregate_id: str
     event_type: str
     status: str
     attempts: int
-    created_at: str
+    last_error: str | None = None
+    claimed_at: datetime | None = None
+    created_at: datetime
+
+
+class OutboxEventReleaseRequest(BaseModel):
+    error: str | None = None
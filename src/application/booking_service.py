@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 
+from src.domain.exceptions import IdempotencyConflictError
 from src.domain.state_machine import BookingStateMachine, BookingStatus
 from src.infrastructure.db.models import Booking
 from src.infrastructure.repositories.booking_repository import BookingRepository
@@ -21,17 +22,35 @@ class BookingService:
         seat_count: int,
         idempotency_key: str,
     ) -> Booking:
-        booking = self.booking_repository.create_booking(
-            user_id=user_id,
-            event_id=event_id,
-            seat_count=seat_count,
-            idempotency_key=idempotency_key,
+        # The INITIATED -> PENDING_PAYMENT step is validated up front and the
+        # booking is inserted in PENDING_PAYMENT, so creation is one INSERT
+        # plus one inventory UPDATE with no follow-up status writes.
+        BookingStateMachine.validate_transition(
+            BookingStatus.INITIATED,
+            BookingStatus.PENDING_PAYMENT,
         )
-
-        self._transition(booking, BookingStatus.PENDING_PAYMENT)
+        try:
+            booking = self.booking_repository.create_booking(
+                user_id=user_id,
+                event_id=event_id,
+                seat_count=seat_count,
+                idempotency_key=idempotency_key,
+                status=BookingStatus.PENDING_PAYMENT,
+            )
+        except IdempotencyConflictError:
+            # Only a retry carrying the same key lands here: a replay of the
+            # same request gets the original booking back, anything else is
+            # a conflict.
+            existing = self.booking_repository.get_by_idempotency_key(idempotency_key)
+            if existing and (existing.user_id, existing.event_id, existing.seat_count) == (
+                user_id,
+                event_id,
+                seat_count,
+            ):
+                return existing
+            raise
         self.seat_repository.decrement_inventory(event_id, seat_count)
-        self._transition(booking, BookingStatus.SUCCESS)
-
+        return booking
 
     def confirm_payment(
         self,
@@ -43,6 +62,15 @@ class BookingService:
         if not booking:
             raise ValueError("Booking not found")
 
+        # Gateways deliver at least once: a repeat of the result that already
+        # settled the booking is answered as-is, without writes or a second
+        # inventory release.
+        if (result, booking.status) in (
+            ("success", BookingStatus.SUCCESS),
+            ("failed", BookingStatus.FAILED),
+        ):
+            return booking
+
         if result == "success":
             self._transition(booking, BookingStatus.SUCCESS)
         elif result == "failed":
@@ -54,8 +82,6 @@ class BookingService:
         else:
             raise ValueError("Invalid payment result")
 
-        self.db.flush()
-        self.db.refresh(booking)
         return booking
 
     def _transition(self, booking: Booking, to_status: BookingStatus) -> None:
@@ -15,6 +15,24 @@ class BookingStatus(str, Enum):
     REFUNDED = "REFUNDED"
 
 
+# Bit i stands for the i-th BookingStatus.
+_STATUS_BITS: Dict[BookingStatus, int] = {
+    status: 1 << index for index, status in enumerate(BookingStatus)
+}
+
+
+def _transition_masks(
+    allowed: Dict[BookingStatus, Set[BookingStatus]],
+) -> Dict[BookingStatus, int]:
+    """
+    Folds each status's allowed successors into one bitmask.
+    """
+    return {
+        status: sum(_STATUS_BITS[target] for target in targets)
+        for status, targets in allowed.items()
+    }
+
+
 class BookingStateMachine:
     """
     Central lifecycle controller for booking transitions.
@@ -40,6 +58,9 @@ class BookingStateMachine:
         BookingStatus.REFUNDED: set(),
     }
 
+    # Hot-path form of the table above: a transition check is one AND.
+    _TRANSITION_MASKS: Dict[BookingStatus, int] = _transition_masks(_ALLOWED_TRANSITIONS)
+
     @classmethod
     def can_transition(
         cls,
@@ -52,7 +73,7 @@ class BookingStateMachine:
         cls._ensure_valid_status(from_status)
         cls._ensure_valid_status(to_status)
 
-        return to_status in cls._ALLOWED_TRANSITIONS.get(from_status, set())
+        return bool(cls._TRANSITION_MASKS[from_status] & _STATUS_BITS[to_status])
 
     @classmethod
     def validate_transition(
@@ -75,7 +96,7 @@ class BookingStateMachine:
         Returns True if the state is terminal (no further transitions allowed).
         """
         cls._ensure_valid_status(status)
-        return len(cls._ALLOWED_TRANSITIONS.get(status, set())) == 0
+        return cls._TRANSITION_MASKS[status] == 0
 
     @classmethod
     def get_allowed_transitions(
@@ -4,14 +4,17 @@ from sqlalchemy import (
     String,
     Integer,
     DateTime,
-    Enum,
+    SmallInteger,
     Text,
     UniqueConstraint,
+    Uuid,
     CheckConstraint,
     ForeignKey,
+    Index,
     func,
 )
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 from uuid import uuid4
 
@@ -19,6 +22,33 @@ from src.infrastructure.db.session import Base
 from src.domain.state_machine import BookingStatus
 
 
+# Stored codes follow BookingStatus declaration order, so new statuses must be
+# appended to the enum, never inserted or reordered.
+_BOOKING_STATUS_CODES: dict[BookingStatus, int] = {
+    status: code for code, status in enumerate(BookingStatus)
+}
+_BOOKING_STATUSES: tuple[BookingStatus, ...] = tuple(BookingStatus)
+
+
+class BookingStatusType(TypeDecorator):
+    """
+    Persists BookingStatus as a SMALLINT code instead of a native enum type.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return _BOOKING_STATUS_CODES[BookingStatus(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return _BOOKING_STATUSES[value]
+
+
 class Booking(Base):
     """
     Booking table reflecting domain state.
@@ -29,7 +59,7 @@ class Booking(Base):
     __tablename__ = "bookings"
 
     id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid4()),
     )
@@ -40,7 +70,7 @@ class Booking(Base):
         nullable=False,
     )
     status: Mapped[BookingStatus] = mapped_column(
-        Enum(BookingStatus, name="booking_status"),
+        BookingStatusType(),
         nullable=False,
         default=BookingStatus.INITIATED,
     )
@@ -69,6 +99,10 @@ class Booking(Base):
             "seat_count > 0",
             name="ck_seat_count_positive",
         ),
+        CheckConstraint(
+            f"status BETWEEN 0 AND {len(_BOOKING_STATUSES) - 1}",
+            name="ck_booking_status_code",
+        ),
     )
 
 
@@ -76,7 +110,7 @@ class SeatInventory(Base):
     __tablename__ = "seat_inventory"
 
     id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid4()),
     )
@@ -110,7 +144,7 @@ class Event(Base):
     __tablename__ = "events"
 
     id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid4()),
     )
@@ -130,24 +164,39 @@ class Event(Base):
         nullable=False,
     )
 
+    seat_types: Mapped[list["EventSeatType"]] = relationship(back_populates="event")
+
+    __table_args__ = (
+        Index("ix_events_title", "title"),
+    )
+
+
+def _initial_available_seats(context) -> int:
+    # New seat types start fully available unless the insert says otherwise.
+    return context.get_current_parameters()["total_seats"]
+
 
 class EventSeatType(Base):
     __tablename__ = "event_seat_types"
 
     id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid4()),
     )
     event_id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         ForeignKey("events.id"),
         nullable=False,
     )
     seat_type: Mapped[str] = mapped_column(String(32), nullable=False)
     price: Mapped[int] = mapped_column(Integer, nullable=False)
     total_seats: Mapped[int] = mapped_column(Integer, nullable=False)
-    available_seats: Mapped[int] = mapped_column(Integer, nullable=False)
+    available_seats: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=_initial_available_seats,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -160,6 +209,8 @@ class EventSeatType(Base):
         nullable=False,
     )
 
+    event: Mapped[Event] = relationship(back_populates="seat_types")
+
     __table_args__ = (
         UniqueConstraint(
             "event_id",
@@ -177,12 +228,12 @@ class EventBooking(Base):
     __tablename__ = "event_bookings"
 
     id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid4()),
     )
     event_id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         ForeignKey("events.id"),
         nullable=False,
     )
@@ -202,6 +253,7 @@ class EventBooking(Base):
 
     __table_args__ = (
         UniqueConstraint("payment_id", name="uq_event_booking_payment_id"),
+        Index("ix_event_bookings_event_id", "event_id"),
     )
 
 
@@ -209,19 +261,19 @@ class EventWaitlistEntry(Base):
     __tablename__ = "event_waitlist"
 
     id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid4()),
     )
     event_id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         ForeignKey("events.id"),
         nullable=False,
     )
     seat_type: Mapped[str] = mapped_column(String(32), nullable=False)
     seat_count: Mapped[int] = mapped_column(Integer, nullable=False)
     status: Mapped[str] = mapped_column(String(16), nullable=False, default="WAITING")
-    booking_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    booking_id: Mapped[str | None] = mapped_column(Uuid(as_uuid=False), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -236,6 +288,7 @@ class EventWaitlistEntry(Base):
 
     __table_args__ = (
         CheckConstraint("seat_count > 0", name="ck_waitlist_seat_count_positive"),
+        Index("ix_waitlist_queue", "event_id", "seat_type", "status", "created_at"),
     )
 
 
@@ -243,7 +296,7 @@ class DiningTableSlot(Base):
     __tablename__ = "dining_table_slots"
 
     id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid4()),
     )
@@ -281,12 +334,12 @@ class DiningTableBooking(Base):
     __tablename__ = "dining_table_bookings"
 
     id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid4()),
     )
     slot_id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         ForeignKey("dining_table_slots.id"),
         nullable=False,
     )
@@ -308,8 +361,11 @@ class DiningTableBooking(Base):
         nullable=False,
     )
 
+    slot: Mapped[DiningTableSlot] = relationship()
+
     __table_args__ = (
         UniqueConstraint("payment_id", name="uq_dining_booking_payment_id"),
+        Index("ix_dining_bookings_slot_id", "slot_id"),
     )
 
 
@@ -317,14 +373,14 @@ class PaymentWebhookEvent(Base):
     __tablename__ = "payment_webhook_events"
 
     id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid4()),
     )
     provider: Mapped[str] = mapped_column(String(32), nullable=False)
     payment_id: Mapped[str] = mapped_column(String(128), nullable=False)
     booking_type: Mapped[str] = mapped_column(String(32), nullable=False)
-    booking_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    booking_id: Mapped[str] = mapped_column(Uuid(as_uuid=False), nullable=False)
     payload_hash: Mapped[str] = mapped_column(String(64), nullable=False)
     status: Mapped[str] = mapped_column(String(32), nullable=False, default="PROCESSED")
     created_at: Mapped[datetime] = mapped_column(
@@ -342,18 +398,19 @@ class OutboxEvent(Base):
     __tablename__ = "outbox_events"
 
     id: Mapped[str] = mapped_column(
-        String(36),
+        Uuid(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid4()),
     )
     aggregate_type: Mapped[str] = mapped_column(String(64), nullable=False)
-    aggregate_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    aggregate_id: Mapped[str] = mapped_column(Uuid(as_uuid=False), nullable=False)
     event_type: Mapped[str] = mapped_column(String(64), nullable=False)
     payload: Mapped[str] = mapped_column(Text, nullable=False)
     dedupe_key: Mapped[str] = mapped_column(String(255), nullable=False)
     status: Mapped[str] = mapped_column(String(32), nullable=False, default="PENDING")
     attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -363,4 +420,5 @@ class OutboxEvent(Base):
 
     __table_args__ = (
         UniqueConstraint("dedupe_key", name="uq_outbox_dedupe_key"),
+        Index("ix_outbox_status_created_at", "status", "created_at"),
     )
@@ -0,0 +1,78 @@
+# src/infrastructure/queue/deferred_booking_queue.py
+
+from contextlib import closing
+import json
+import sqlite3
+
+
+class DeferredBookingQueue:
+    """
+    FIFO of event bookings deferred while Postgres is degraded.
+
+    Backed by a host-local SQLite file instead of Postgres (which is what is
+    unavailable when this queue is used), so all worker processes on the host
+    share one queue and queued requests survive a restart.
+    """
+
+    def __init__(self, path: str, max_size: int):
+        self.path = path
+        self.max_size = max_size
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS deferred_event_bookings (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    request_id TEXT NOT NULL UNIQUE,
+                    item TEXT NOT NULL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit; enqueue opens its own write transaction.
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def enqueue(self, item: dict) -> bool:
+        """
+        Appends item unless the queue is full.
+        BEGIN IMMEDIATE makes the size check and insert atomic across processes.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                (size,) = conn.execute("SELECT COUNT(*) FROM deferred_event_bookings").fetchone()
+                if size >= self.max_size:
+                    conn.execute("ROLLBACK")
+                    return False
+                conn.execute(
+                    "INSERT INTO deferred_event_bookings (request_id, item) VALUES (?, ?)",
+                    (item["request_id"], json.dumps(item)),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def get(self, request_id: str) -> dict | None:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT item FROM deferred_event_bookings WHERE request_id = ?",
+                (request_id,),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def remove(self, request_id: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "DELETE FROM deferred_event_bookings WHERE request_id = ?",
+                (request_id,),
+            )
+
+    def list(self) -> list[dict]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT item FROM deferred_event_bookings ORDER BY seq"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
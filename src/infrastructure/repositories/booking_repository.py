@@ -1,7 +1,8 @@
 # src/infrastructure/repositories/booking_repository.py
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from src.infrastructure.db.models import Booking
 from src.domain.exceptions import IdempotencyConflictError
@@ -39,25 +40,30 @@ class BookingRepository:
         event_id: str,
         seat_count: int,
         idempotency_key: str,
+        status: BookingStatus = BookingStatus.INITIATED,
     ) -> Booking:
 
-        # Idempotency Check
-        existing = self.get_by_idempotency_key(idempotency_key)
+        # Idempotency check and insert in one round-trip: the unique key
+        # makes a duplicate insert nothing, so no row comes back.
+        stmt = (
+            pg_insert(Booking)
+            .values(
+                user_id=user_id,
+                event_id=event_id,
+                seat_count=seat_count,
+                idempotency_key=idempotency_key,
+                status=status,
+            )
+            .on_conflict_do_nothing(index_elements=[Booking.idempotency_key])
+            .returning(Booking)
+        )
+        booking = self.db.scalars(stmt).one_or_none()
 
-        if existing:
+        if not booking:
             raise IdempotencyConflictError(
                 "Duplicate idempotent request"
             )
 
-        booking = Booking(
-            user_id=user_id,
-            event_id=event_id,
-            seat_count=seat_count,
-            idempotency_key=idempotency_key,
-            status=BookingStatus.INITIATED,
-        )
-
-        self.db.add(booking)
         return booking
 
     def update_status(
@@ -65,5 +71,16 @@ class BookingRepository:
         booking: Booking,
         new_status: BookingStatus,
     ) -> None:
-
-        booking.status = new_status
+        """
+        UPDATE ... RETURNING refreshes the booking from the written row, so
+        callers need no flush + refresh round-trip to see it.
+        """
+
+        stmt = (
+            update(Booking)
+            .where(Booking.id == booking.id)
+            .values(status=new_status)
+            .returning(Booking)
+            .execution_options(populate_existing=True)
+        )
+        self.db.scalars(stmt).one()
@@ -0,0 +1,55 @@
+# src/infrastructure/repositories/outbox_repository.py
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, or_, select, update
+
+from src.infrastructure.db.models import OutboxEvent
+
+
+class OutboxRepository:
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim_batch(self, limit: int, lease_seconds: float) -> list[OutboxEvent]:
+        """
+        Moves up to `limit` of the oldest claimable events to IN_FLIGHT in one
+        UPDATE ... RETURNING. Claimable means PENDING, or IN_FLIGHT with a
+        claim older than `lease_seconds`: its publisher is presumed dead, so
+        the event is handed out again. SKIP LOCKED lets concurrent publishers
+        claim disjoint batches instead of queueing on the same rows.
+        """
+
+        lease_expired_before = datetime.now(timezone.utc) - timedelta(seconds=lease_seconds)
+        claimable = (
+            select(OutboxEvent.id)
+            .where(
+                or_(
+                    OutboxEvent.status == "PENDING",
+                    and_(
+                        OutboxEvent.status == "IN_FLIGHT",
+                        OutboxEvent.claimed_at < lease_expired_before,
+                    ),
+                )
+            )
+            .order_by(OutboxEvent.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(claimable.scalar_subquery()))
+            .values(
+                status="IN_FLIGHT",
+                attempts=OutboxEvent.attempts + 1,
+                claimed_at=func.now(),
+            )
+            .returning(OutboxEvent)
+            .execution_options(synchronize_session=False)
+        )
+
+        events = list(self.db.scalars(stmt))
+        events.sort(key=lambda event: event.created_at)
+        return events
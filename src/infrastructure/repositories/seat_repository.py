@@ -1,7 +1,7 @@
 # src/infrastructure/repositories/seat_repository.py
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import case, select, update
 
 from src.infrastructure.db.models import SeatInventory
 from src.domain.exceptions import InsufficientInventoryError
@@ -12,25 +12,6 @@ class SeatRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def lock_inventory(self, event_id: str) -> SeatInventory:
-        """
-        SELECT ... FOR UPDATE
-        Prevents race conditions.
-        """
-
-        stmt = (
-            select(SeatInventory)
-            .where(SeatInventory.event_id == event_id)
-            .with_for_update()
-        )
-
-        inventory = self.db.execute(stmt).scalar_one_or_none()
-
-        if not inventory:
-            raise ValueError("Inventory not found")
-
-        return inventory
-
     def get_by_event_id(self, event_id: str) -> SeatInventory | None:
         stmt = select(SeatInventory).where(SeatInventory.event_id == event_id)
         return self.db.execute(stmt).scalar_one_or_none()
@@ -60,14 +41,49 @@ class SeatRepository:
         event_id: str,
         seat_count: int,
     ) -> None:
+        """
+        Conditional UPDATE: the availability check and the decrement are one
+        statement under the row lock it takes, so no SELECT ... FOR UPDATE.
+        """
+
+        stmt = (
+            update(SeatInventory)
+            .where(SeatInventory.event_id == event_id)
+            .where(SeatInventory.available_seats >= seat_count)
+            .values(available_seats=SeatInventory.available_seats - seat_count)
+            .execution_options(synchronize_session=False)
+        )
 
-        inventory.available_seats -= seat_count
+        if self.db.execute(stmt).rowcount == 0:
+            if not self.get_by_event_id(event_id):
+                raise ValueError("Inventory not found")
+            raise InsufficientInventoryError("Insufficient seats available")
 
     def increment_inventory(
         self,
         event_id: str,
         seat_count: int,
     ) -> None:
+        """
+        Single UPDATE, mirroring decrement_inventory. The release is capped at
+        total_seats: after /inventory/seed resets availability, seats of
+        bookings made before the reset are already counted as available.
+        """
+
+        stmt = (
+            update(SeatInventory)
+            .where(SeatInventory.event_id == event_id)
+            .values(
+                available_seats=case(
+                    (
+                        SeatInventory.available_seats + seat_count > SeatInventory.total_seats,
+                        SeatInventory.total_seats,
+                    ),
+                    else_=SeatInventory.available_seats + seat_count,
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
 
-        inventory = self.lock_inventory(event_id)
-        inventory.available_seats += seat_count
+        if self.db.execute(stmt).rowcount == 0:
+            raise ValueError("Inventory not found")
@@ -1,12 +1,14 @@
 import logging
 import os
+import threading
 import time
 
+import anyio.to_thread
 from fastapi import FastAPI
 from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 
-from src.api.routes.routes import router
+from src.api.routes.routes import expire_unordered_holds, router
 from src.infrastructure.db.session import engine
 from src.infrastructure.db.models import Base
 
@@ -15,6 +17,11 @@ app = FastAPI(title="District Integrity Engine")
 app.include_router(router)
 logger = logging.getLogger(__name__)
 
+# How often each process looks for booking holds that never got a payment
+# order; 0 disables the reaper (e.g. when a single dedicated process runs it).
+HOLD_REAPER_INTERVAL_SECONDS = float(os.getenv("HOLD_REAPER_INTERVAL_SECONDS", "60"))
+_hold_reaper_stop = threading.Event()
+
 
 def _wait_for_db() -> None:
     # Handles the common case where API starts before Postgres is ready.
@@ -43,7 +50,41 @@ def _wait_for_db() -> None:
             time.sleep(retry_delay_seconds)
 
 
+@app.on_event("startup")
+async def size_threadpool() -> None:
+    # Sync routes (including Razorpay signature verification) run on anyio's
+    # worker threads; the default of 40 caps concurrent requests per process.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = int(os.getenv("API_THREADPOOL_SIZE", "40"))
+
+
 @app.on_event("startup")
 def on_startup() -> None:
     _wait_for_db()
     Base.metadata.create_all(bind=engine)
+
+
+def _reap_unordered_holds() -> None:
+    # Releases are guarded per booking, so reapers in several workers (or a
+    # request compensating concurrently) never release the same hold twice.
+    while not _hold_reaper_stop.wait(HOLD_REAPER_INTERVAL_SECONDS):
+        try:
+            released = expire_unordered_holds()
+        except Exception:
+            logger.exception("Expiring unordered booking holds failed; retrying next interval.")
+            continue
+        if released:
+            logger.warning("Released %s booking holds that never got a payment order.", released)
+
+
+@app.on_event("startup")
+def start_hold_reaper() -> None:
+    if HOLD_REAPER_INTERVAL_SECONDS <= 0:
+        return
+    _hold_reaper_stop.clear()
+    threading.Thread(target=_reap_unordered_holds, name="hold-reaper", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def stop_hold_reaper() -> None:
+    _hold_reaper_stop.set()
@@ -0,0 +1,6 @@
+# tests/conftest.py
+
+# Import the domain and the app (ORM metadata, routes) while pytest starts up,
+# so first-import cost is not billed to whichever test happens to run first.
+from src.domain import exceptions, state_machine  # noqa: F401
+from src.main import app  # noqa: F401
@@ -0,0 +1,44 @@
+# tests/integration/conftest.py
+
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from helpers import create_booking
+from src.main import app
+
+
+# These tests drive the legacy /inventory and /bookings flow, which also runs
+# on SQLite, so besides Postgres they can run against a throwaway SQLite
+# file (DATABASE_URL=sqlite:////tmp/it.db). The event and dining routes are
+# Postgres-only and are not covered here.
+@pytest.fixture(scope="session")
+def client():
+    # One app + lifespan (DB wait, create_all) for the whole run.
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def seeded_event(client):
+    # Seeded once per worker; tests use fresh idempotency keys instead of
+    # re-seeding. Under pytest-xdist each worker gets its own inventory row.
+    event_id = f"event1-{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}"
+    response = client.post(
+        "/inventory/seed",
+        json={"event_id": event_id, "total_seats": 10_000},
+    )
+    assert response.status_code == 200
+    return event_id
+
+
+@pytest.fixture
+def booking_id(client, seeded_event, request):
+    # A fresh PENDING_PAYMENT booking; parametrize with indirect=True to book
+    # more than one seat.
+    return create_booking(
+        client,
+        seeded_event,
+        seat_count=getattr(request, "param", 1),
+    )
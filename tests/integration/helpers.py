@@ -0,0 +1,32 @@
+# tests/integration/helpers.py
+
+from uuid import uuid4
+
+
+def create_booking(client, event_id: str, user_id: str = "user1", seat_count: int = 1) -> str:
+    response = client.post(
+        "/bookings",
+        json={
+            "user_id": user_id,
+            "event_id": event_id,
+            "seat_count": seat_count,
+            "idempotency_key": uuid4().hex,
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "PENDING_PAYMENT"
+    return response.json()["booking_id"]
+
+
+def run_booking_flow(client, event_id: str, user_id: str, seat_count: int, pay_result: str) -> dict:
+    """
+    Books seats on an already seeded event and pays for them through the
+    shared client; returns the pay response body.
+    """
+    booking_id = create_booking(client, event_id, user_id=user_id, seat_count=seat_count)
+    response = client.post(
+        f"/bookings/{booking_id}/pay",
+        json={"result": pay_result},
+    )
+    assert response.status_code == 200
+    return response.json()
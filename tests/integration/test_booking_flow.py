@@ -1,28 +1,42 @@
-def test_booking_flow(client):
+import pytest
 
-    seed_payload = {
-        "event_id": "event1",
-        "total_seats": 10,
-    }
-    seed_response = client.post("/inventory/seed", json=seed_payload)
-    assert seed_response.status_code == 200
+from helpers import run_booking_flow
 
-    payload = {
-        "user_id": "user1",
-        "event_id": "event1",
-        "seat_count": 1,
-        "idempotency_key": "abc123",
-    }
 
-    response = client.post("/bookings", json=payload)
+@pytest.mark.parametrize(
+    "pay_result,expected_status",
+    [("success", "SUCCESS"), ("failed", "FAILED")],
+)
+def test_booking_flow(client, seeded_event, pay_result, expected_status):
+    result = run_booking_flow(
+        client,
+        event_id=seeded_event,
+        user_id="user1",
+        seat_count=1,
+        pay_result=pay_result,
+    )
+    assert result["status"] == expected_status
 
-    assert response.status_code == 200
-    booking_id = response.json()["booking_id"]
-    assert response.json()["status"] == "PENDING_PAYMENT"
 
-    pay_response = client.post(
-        f"/bookings/{booking_id}/pay",
-        json={"result": "success"},
-    )
-    assert pay_response.status_code == 200
-    assert pay_response.json()["status"] == "SUCCESS"
\ No newline at end of file
+@pytest.mark.parametrize(
+    "pay_result,expected_status",
+    [("success", "SUCCESS"), ("failed", "FAILED")],
+)
+@pytest.mark.parametrize("booking_id", [1, 2], indirect=True)
+def test_repeated_payment_result_is_idempotent(
+    client, seeded_event, booking_id, pay_result, expected_status
+):
+    available_after = []
+    for _ in range(2):
+        pay_response = client.post(
+            f"/bookings/{booking_id}/pay",
+            json={"result": pay_result},
+        )
+        assert pay_response.status_code == 200
+        assert pay_response.json()["status"] == expected_status
+        inventory = client.get(f"/inventory/{seeded_event}")
+        assert inventory.status_code == 200
+        available_after.append(inventory.json()["available_seats"])
+
+    # A repeated "failed" must not release the seats a second time.
+    assert available_after[1] == available_after[0]
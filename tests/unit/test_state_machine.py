@@ -1,72 +1,77 @@
 # tests/unit/test_state_machine.py
 
+from itertools import product
+
 import pytest
 
 from src.domain.state_machine import BookingStateMachine, BookingStatus
 from src.domain.exceptions import InvalidStateTransitionError
 
 
-# ---------------------
-# VALID TRANSITIONS
-# ---------------------
-
-def test_valid_happy_path():
-    assert BookingStateMachine.can_transition(
-        BookingStatus.INITIATED,
-        BookingStatus.PENDING_PAYMENT,
-    )
-
-    assert BookingStateMachine.can_transition(
-        BookingStatus.PENDING_PAYMENT,
-        BookingStatus.SUCCESS,
-    )
+INITIATED = BookingStatus.INITIATED
+PENDING_PAYMENT = BookingStatus.PENDING_PAYMENT
+SUCCESS = BookingStatus.SUCCESS
+FAILED = BookingStatus.FAILED
+REFUND_PENDING = BookingStatus.REFUND_PENDING
+REFUNDED = BookingStatus.REFUNDED
 
-    assert BookingStateMachine.can_transition(
-        BookingStatus.SUCCESS,
-        BookingStatus.REFUND_PENDING,
-    )
+VALID_PAIRS = [
+    (INITIATED, PENDING_PAYMENT),
+    (PENDING_PAYMENT, SUCCESS),
+    (SUCCESS, REFUND_PENDING),
+    (REFUND_PENDING, REFUNDED),
+]
 
-    assert BookingStateMachine.can_transition(
-        BookingStatus.REFUND_PENDING,
-        BookingStatus.REFUNDED,
-    )
+INVALID_PAIRS = [
+    (INITIATED, SUCCESS),  # skips payment
+    (FAILED, SUCCESS),
+    (REFUNDED, SUCCESS),
+]
 
 
 # ---------------------
-# INVALID TRANSITIONS
+# VALID TRANSITIONS
 # ---------------------
 
-def test_cannot_skip_payment():
-    with pytest.raises(InvalidStateTransitionError):
-        BookingStateMachine.validate_transition(
-            BookingStatus.INITIATED,
-            BookingStatus.SUCCESS,
+@pytest.mark.parametrize(
+    "from_status,to_status",
+    VALID_PAIRS,
+    ids=[f"{src.name}->{dst.name}" for src, dst in VALID_PAIRS],
+)
+def test_valid_happy_path(from_status, to_status):
+    assert BookingStateMachine.can_transition(from_status, to_status)
+
+
+def test_can_transition_matches_allowed_transitions():
+    # Every (from, to) pair in one test: 36 checks, one collected item.
+    for from_status, to_status in product(BookingStatus, repeat=2):
+        expected = to_status in BookingStateMachine.get_allowed_transitions(from_status)
+        assert BookingStateMachine.can_transition(from_status, to_status) is expected, (
+            from_status,
+            to_status,
         )
 
 
-def test_terminal_state_failed():
-    assert BookingStateMachine.is_terminal(BookingStatus.FAILED)
-
-    with pytest.raises(InvalidStateTransitionError):
-        BookingStateMachine.validate_transition(
-            BookingStatus.FAILED,
-            BookingStatus.SUCCESS,
-        )
+# ---------------------
+# INVALID TRANSITIONS
+# ---------------------
 
+def test_invalid_transitions():
+    for from_status, to_status in INVALID_PAIRS:
+        with pytest.raises(InvalidStateTransitionError):
+            BookingStateMachine.validate_transition(from_status, to_status)
 
-def test_terminal_state_refunded():
-    assert BookingStateMachine.is_terminal(BookingStatus.REFUNDED)
 
-    with pytest.raises(InvalidStateTransitionError):
-        BookingStateMachine.validate_transition(
-            BookingStatus.REFUNDED,
-            BookingStatus.SUCCESS,
-        )
+@pytest.mark.parametrize("status", [FAILED, REFUNDED])
+def test_terminal_states(status):
+    assert BookingStateMachine.is_terminal(status)
 
 
-def test_invalid_type_guard():
+@pytest.mark.parametrize(
+    "bad",
+    ["INITIATED", None, 0, object()],
+    ids=["str", "none", "int", "object"],
+)
+def test_invalid_type_guard(bad):
     with pytest.raises(TypeError):
-        BookingStateMachine.validate_transition(
-            "INITIATED",  # invalid type
-            BookingStatus.SUCCESS,
-        )
+        BookingStateMachine.validate_transition(bad, SUCCESS)